@@ -0,0 +1,347 @@
+"""
+Event-loop responsiveness watchdog for Flet apps.
+
+Measures how late the event loop wakes up (lag), times event handlers and
+flags anything that blocks longer than a threshold, with a sample of the
+stack that was running at the time. A summary is printed, and optionally
+written to a file, when the app shuts down.
+
+Enable it with environment variables:
+
+    LOOP_WATCHDOG=true
+    LOOP_WATCHDOG_THRESHOLD_MS=100       # what counts as blocking
+    LOOP_WATCHDOG_REPORT=watchdog.json   # also write the summary as JSON
+
+and wire it into the app:
+
+    from loop_watchdog import install, watch
+
+    def main(page):
+        install(page)
+
+    @watch
+    async def on_click(e): ...
+
+The Flet apps of the repository install it from this folder
+(pip install -e ../loop_watchdog, or through their pyproject.toml).
+"""
+
+import asyncio
+import atexit
+import functools
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+ENABLED = os.getenv("LOOP_WATCHDOG", "false").lower() in ("1", "true", "yes")
+THRESHOLD = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100")) / 1000
+REPORT_FILE = os.getenv("LOOP_WATCHDOG_REPORT", "")
+
+# Most recent stalls kept with their stack samples
+MAX_STALLS = 50
+# Lag samples kept for the percentiles (a uniform sample of all heartbeats)
+MAX_LAG_SAMPLES = 2000
+
+
+class HandlerStats:
+    """Call count and timings of one event handler."""
+
+    __slots__ = ("calls", "total", "max", "slow")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+
+
+class _OnLoopTimer:
+    """
+    Await a coroutine while adding up the time it spends running.
+
+    Each step between two awaits is timed, so waiting on I/O or sleeps
+    does not count; only what kept the event loop busy does.
+    """
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.busy = 0.0
+
+    def __await__(self):
+        value, error = None, None
+        while True:
+            start = time.monotonic()
+            try:
+                if error is not None:
+                    future = self.coro.throw(error)
+                else:
+                    future = self.coro.send(value)
+            except StopIteration as done:
+                return done.value
+            finally:
+                self.busy += time.monotonic() - start
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                self.coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+class LoopWatchdog:
+    """
+    Heartbeat on the event loop plus a monitor thread.
+
+    The heartbeat sleeps for ``interval`` and records how much later than
+    that it woke up. The monitor thread notices when the heartbeat (or a
+    handler) has been stuck for longer than ``threshold`` and samples the
+    stack of the thread that is blocking.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.lags: List[float] = []  # reservoir of at most MAX_LAG_SAMPLES
+        self.beats = 0
+        self.max_lag = 0.0
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.stalls: List[Dict] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._sampled_beat = 0.0  # heartbeat whose stall was already sampled
+        self._running: Dict[int, tuple] = {}  # thread id -> (handler, start, sampled)
+        self._heartbeat: Optional[asyncio.Future] = None
+        self._stop = threading.Event()
+        self._stopped = False
+        self.started = time.monotonic()
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start the heartbeat on ``loop`` (from any thread) and the monitor thread."""
+        self._loop = loop
+        self._heartbeat = asyncio.run_coroutine_threadsafe(self._beat(), loop)
+        threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True).start()
+
+    async def _beat(self):
+        self._loop_thread = threading.get_ident()
+        while True:
+            before = time.monotonic()
+            self._last_beat = before
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - before - self.interval
+            with self._lock:
+                self.beats += 1
+                self.max_lag = max(self.max_lag, lag)
+                if len(self.lags) < MAX_LAG_SAMPLES:
+                    self.lags.append(lag)
+                else:
+                    slot = random.randrange(self.beats)
+                    if slot < MAX_LAG_SAMPLES:
+                        self.lags[slot] = lag
+            if lag > self.threshold:
+                self._finish_stall(before, lag)
+
+    def _monitor(self):
+        """Sample the stack of whatever has been blocking for too long."""
+        while not self._stop.wait(self.threshold / 2):
+            now = time.monotonic()
+            beat = self._last_beat
+            if (
+                self._loop_thread is not None
+                and now - beat > self.threshold + self.interval
+                and self._sampled_beat != beat
+            ):
+                self._sampled_beat = beat
+                self._record_stall("event loop", self._loop_thread, beat)
+
+            for thread_id, (name, start, sampled) in list(self._running.items()):
+                if not sampled and now - start > self.threshold:
+                    self._running[thread_id] = (name, start, True)
+                    self._record_stall(f"handler {name}", thread_id, start)
+
+    def _record_stall(self, what: str, thread_id: int, since: float):
+        frame = sys._current_frames().get(thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        with self._lock:
+            self.stalls.append({
+                "what": what,
+                "at": round(since - self.started, 3),
+                "duration": None,  # filled in when it ends, if it does
+                "stack": stack,
+            })
+            del self.stalls[:-MAX_STALLS]
+
+    def _finish_stall(self, since: float, lag: float):
+        """Store the final duration of a loop stall sampled by the monitor."""
+        at = round(since - self.started, 3)
+        with self._lock:
+            for stall in reversed(self.stalls):
+                if stall["what"] == "event loop" and stall["at"] == at:
+                    stall["duration"] = round(lag, 3)
+                    return
+            # Too short for the monitor to catch it mid-way
+            self.stalls.append({"what": "event loop", "at": at, "duration": round(lag, 3), "stack": ""})
+            del self.stalls[:-MAX_STALLS]
+
+    def handler_started(self, name: str) -> bool:
+        """Track a sync handler; returns False if it was called by another one."""
+        thread_id = threading.get_ident()
+        if thread_id in self._running:
+            return False
+        self._running[thread_id] = (name, time.monotonic(), False)
+        return True
+
+    def handler_finished(self, name: str, elapsed: float, outermost: bool = True):
+        running = self._running.pop(threading.get_ident(), None) if outermost else None
+        with self._lock:
+            if running is not None and running[2]:
+                # Sampled by the monitor while it was running
+                for stall in reversed(self.stalls):
+                    if stall["what"] == f"handler {name}" and stall["duration"] is None:
+                        stall["duration"] = round(elapsed, 3)
+                        break
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = HandlerStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            if elapsed > self.threshold:
+                stats.slow += 1
+
+    def summary(self) -> Dict:
+        """All measurements as JSON-serializable data."""
+        with self._lock:
+            lags = sorted(self.lags)
+            max_lag = self.max_lag
+            handlers = {
+                name: {
+                    "calls": s.calls,
+                    "mean_ms": round(s.total / s.calls * 1000, 1),
+                    "max_ms": round(s.max * 1000, 1),
+                    "slow_calls": s.slow,
+                }
+                for name, s in sorted(self.handlers.items(), key=lambda item: -item[1].max)
+            }
+            stalls = list(self.stalls)
+
+        lag = {}
+        if len(lags) >= 2:
+            cuts = statistics.quantiles(lags, n=100, method="inclusive")
+            lag = {
+                "p50_ms": round(cuts[49] * 1000, 1),
+                "p99_ms": round(cuts[98] * 1000, 1),
+                "max_ms": round(max_lag * 1000, 1),
+            }
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "loop_lag": lag,
+            "handlers": handlers,
+            "stalls": stalls,
+        }
+
+    def format_summary(self, summary: Dict) -> str:
+        lines = [f"Loop watchdog (threshold {summary['threshold_ms']:.0f} ms, up {summary['uptime_s']} s)"]
+        lag = summary["loop_lag"]
+        if lag:
+            lines.append(
+                f"  loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms"
+            )
+        for name, s in summary["handlers"].items():
+            lines.append(
+                f"  {name}: {s['calls']} calls, mean {s['mean_ms']} ms, "
+                f"max {s['max_ms']} ms, {s['slow_calls']} slow"
+            )
+        lines.append(f"  {len(summary['stalls'])} stalls over the threshold")
+        for stall in summary["stalls"][-5:]:
+            duration = f"{stall['duration'] * 1000:.0f} ms" if stall["duration"] else "ongoing"
+            lines.append(f"  - {stall['what']} at {stall['at']} s, {duration}")
+            if stall["stack"]:
+                lines.extend("      " + line for line in stall["stack"].rstrip().splitlines()[-6:])
+        return "\n".join(lines)
+
+    def stop(self):
+        """Stop measuring and report (safe to call more than once)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._stop.set()
+        if self._heartbeat is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._heartbeat.cancel)
+
+        summary = self.summary()
+        print(self.format_summary(summary), file=sys.stderr)
+        if REPORT_FILE:
+            with open(REPORT_FILE, "w") as f:
+                json.dump(summary, f, indent=2)
+
+
+_active: Optional[LoopWatchdog] = None
+
+
+def install(page) -> Optional[LoopWatchdog]:
+    """
+    Start watching a Flet page's event loop, if LOOP_WATCHDOG is set.
+
+    The summary is written when the process exits.
+    """
+    global _active
+    if not ENABLED:
+        return None
+    if _active is None:
+        _active = LoopWatchdog()
+        _active.start(page.loop)
+        atexit.register(_active.stop)
+    return _active
+
+
+def watch(handler: Callable = None, *, name: Optional[str] = None):
+    """
+    Decorator timing an event handler (sync or async).
+
+    Async handlers are timed only while they run on the loop, not while
+    they await.
+
+    Costs one global lookup per call while the watchdog is not installed.
+    Usable as @watch, @watch(name="...") or watch(func, name="...").
+    """
+    if handler is None:
+        return lambda func: watch(func, name=name)
+    label = name or handler.__qualname__
+
+    if asyncio.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(*args, **kwargs):
+            watchdog = _active
+            if watchdog is None:
+                return await handler(*args, **kwargs)
+            timer = _OnLoopTimer(handler(*args, **kwargs))
+            try:
+                return await timer
+            finally:
+                # Only the time spent on the loop; async handlers run on the
+                # loop thread, where a sync handler may be the tracked one
+                watchdog.handler_finished(label, timer.busy, outermost=False)
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        watchdog = _active
+        if watchdog is None:
+            return handler(*args, **kwargs)
+        outermost = watchdog.handler_started(label)
+        start = time.monotonic()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            watchdog.handler_finished(label, time.monotonic() - start, outermost)
+    return wrapper
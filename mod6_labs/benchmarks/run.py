@@ -0,0 +1,172 @@
+"""
+Benchmark WeatherService against the local OpenWeatherMap stand-in.
+
+Run from the mod6_labs folder:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --requests 500 --latency 80 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from config import Config
+from weather_service import WeatherService, WeatherServiceError
+from benchmarks.stand_in import OpenWeatherStandIn
+
+
+def summarize(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Turn raw timings into p50/p95/p99 latency (ms) and throughput."""
+    calls = len(latencies) + errors
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "scenario": name,
+        "calls": calls,
+        "errors": errors,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "rps": calls / elapsed if elapsed else 0.0,
+    }
+
+
+async def measure(
+    name: str,
+    calls: List[Callable[[], Awaitable]],
+    concurrency: int,
+) -> Dict:
+    """Run the calls with bounded concurrency and time each one."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def timed(call):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except WeatherServiceError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(call) for call in calls))
+    return summarize(name, latencies, errors, time.perf_counter() - start)
+
+
+async def bench_single(stand_in: OpenWeatherStandIn, args) -> Dict:
+    """Uncached lookups of distinct cities."""
+    async with WeatherService(transport=stand_in.transport()) as service:
+        cities = [f"single-city-{i}" for i in range(args.requests)]
+        return await measure(
+            "single lookup",
+            [lambda city=city: service.get_weather(city) for city in cities],
+            args.concurrency,
+        )
+
+
+async def bench_bulk(stand_in: OpenWeatherStandIn, args) -> Dict:
+    """Saved-city loads through get_weather_many, starting cold each round."""
+    rounds = iter(range(args.rounds))
+
+    async def load_all():
+        # New city names every round so neither cache can answer
+        n = next(rounds)
+        cities = [f"saved-city-{n}-{i}" for i in range(args.cities)]
+        async with WeatherService(transport=stand_in.transport()) as service:
+            async for _, _, error in service.get_weather_many(cities):
+                if error:
+                    raise error
+
+    result = await measure("bulk saved-city load", [load_all] * args.rounds, 1)
+    result["cities_per_s"] = result["rps"] * args.cities
+    return result
+
+
+async def bench_cache_hit(stand_in: OpenWeatherStandIn, args) -> Dict:
+    """Repeat lookups answered from the in-memory cache."""
+    async with WeatherService(transport=stand_in.transport()) as service:
+        cities = [f"cached-city-{i}" for i in range(args.cities)]
+        for city in cities:
+            await service.get_weather(city)
+        return await measure(
+            "cache hit",
+            [lambda i=i: service.get_weather(cities[i % len(cities)])
+             for i in range(args.requests)],
+            args.concurrency,
+        )
+
+
+SCENARIOS = {
+    "single": bench_single,
+    "bulk": bench_bulk,
+    "cache": bench_cache_hit,
+}
+
+
+def print_report(results: List[Dict]):
+    """Print the results as a table."""
+    header = f"{'scenario':<22}{'calls':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<22}{r['calls']:>7}{r['errors']:>8}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['rps']:>10.1f}"
+        )
+        if "cities_per_s" in r:
+            print(f"{'':<22}{r['cities_per_s']:.1f} cities/s")
+
+
+async def main(args):
+    stand_in = OpenWeatherStandIn(
+        latency=args.latency / 1000,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        seed=args.seed,
+    )
+
+    # The stand-in has no quota, so only throttle when asked to
+    Config.RATE_LIMIT_PER_MINUTE = args.rate_limit or 10 ** 9
+
+    # Keep the benchmark's disk cache away from the app's one
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DISK_CACHE_FILE = os.path.join(tmp, "weather_cache.db")
+        results = []
+        for name in args.scenario:
+            results.append(await SCENARIOS[name](stand_in, args))
+
+    print_report(results)
+    print(f"\nStand-in served {stand_in.requests} requests")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="calls per lookup scenario")
+    parser.add_argument("--cities", type=int, default=30, help="saved cities per bulk load")
+    parser.add_argument("--rounds", type=int, default=10, help="bulk loads to run")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=50, help="median latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.3, help="log-normal sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rate-limit", type=int, default=0, help="calls per minute (0 = off)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,139 @@
+"""In-process stand-in for the OpenWeatherMap endpoints used by the app."""
+
+import asyncio
+import random
+import zlib
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+class OpenWeatherStandIn:
+    """
+    Fake /weather, /forecast, /group and /onecall endpoints.
+
+    Served through an httpx mock transport, so no network or API key is
+    needed. Latency follows a log-normal distribution and a share of the
+    requests can fail with a 5xx or time out.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.3,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Median response time in seconds
+            jitter: Spread of the log-normal latency distribution (sigma)
+            error_rate: Share of requests answered with a 503
+            timeout_rate: Share of requests that raise a timeout
+            seed: Seed for reproducible runs
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.names: Dict[int, str] = {}  # city ID -> name it was looked up by
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport to pass to WeatherService."""
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer one request like the real API would."""
+        self.requests += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.random.lognormvariate(0, self.jitter) * self.latency)
+
+        roll = self.random.random()
+        if roll < self.timeout_rate:
+            raise httpx.ReadTimeout("Stand-in timeout", request=request)
+        if roll < self.timeout_rate + self.error_rate:
+            return httpx.Response(503, json={"cod": 503, "message": "Service unavailable"})
+
+        params = request.url.params
+        endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint == "weather":
+            return httpx.Response(200, json=self.current(params.get("q") or params.get("id", "")))
+        if endpoint == "group":
+            items = [self.current(city_id) for city_id in params.get("id", "").split(",")]
+            return httpx.Response(200, json={"cnt": len(items), "list": items})
+        if endpoint == "forecast":
+            return httpx.Response(200, json=self.forecast(params.get("q") or params.get("id", "")))
+        if endpoint == "onecall":
+            return httpx.Response(200, json=self.onecall())
+        return httpx.Response(404, json={"cod": "404", "message": "Not found"})
+
+    def resolve(self, city: str) -> Tuple[int, str]:
+        """
+        Stable fake ID and display name for a city given by name or ID.
+
+        IDs are returned as is, with the name they were first looked up by,
+        so requests by ID (/group, /forecast?id=) name the city like /weather.
+        """
+        city = str(city).strip()
+        if city.isdigit():
+            city_id = int(city)
+            return city_id, self.names.get(city_id, city)
+        city_id = zlib.crc32(city.casefold().encode()) % 10_000_000
+        return city_id, self.names.setdefault(city_id, city.title())
+
+    def current(self, city: str) -> Dict:
+        """Build a /weather response."""
+        city_id, name = self.resolve(city)
+        temp = (city_id % 400) / 10 - 5
+        return {
+            "id": city_id,
+            "name": name,
+            "coord": {"lat": (city_id % 180) - 90, "lon": (city_id % 360) - 180},
+            "sys": {"country": "XX"},
+            "dt": 1_760_000_000,
+            "timezone": (city_id % 25 - 12) * 3600,
+            "weather": [{"description": "scattered clouds", "icon": "03d"}],
+            "main": {
+                "temp": temp,
+                "feels_like": temp - 1,
+                "temp_min": temp - 2,
+                "temp_max": temp + 2,
+                "humidity": city_id % 100,
+                "pressure": 1000 + city_id % 30,
+            },
+            "wind": {"speed": (city_id % 150) / 10},
+            "clouds": {"all": city_id % 100},
+        }
+
+    def forecast(self, city: str) -> Dict:
+        """Build a /forecast response with 40 three-hour slots."""
+        city_id, name = self.resolve(city)
+        base = (city_id % 400) / 10 - 5
+        return {
+            "city": {
+                "id": city_id,
+                "name": name,
+                "country": "XX",
+                "timezone": (city_id % 25 - 12) * 3600,
+            },
+            "list": [
+                {
+                    "dt": 1_760_000_000 + i * 10_800,
+                    "main": {"temp": base + i % 8, "temp_min": base, "temp_max": base + 8},
+                    "weather": [{"icon": ("01d", "03d", "10d")[i % 3]}],
+                    "wind": {"speed": i % 10},
+                    "rain": {"3h": 0.5} if i % 5 == 0 else {},
+                }
+                for i in range(40)
+            ],
+        }
+
+    def onecall(self) -> Dict:
+        """Build a minimal One Call response."""
+        return {
+            "timezone_offset": 0,
+            "hourly": [{"dt": 1_760_000_000 + i * 3600, "temp": 20.0} for i in range(48)],
+        }
@@ -0,0 +1,300 @@
+"""
+Record and replay OpenWeatherMap traffic.
+
+In record mode real responses are captured to a cassette, a gzipped NDJSON
+file with one response per line. In replay mode the cassette answers every
+request without network or API key, with configurable latency, so
+WeatherService and the app can be load-tested and profiled offline:
+
+    WEATHER_TRANSPORT=record python main.py       # use the app normally
+    WEATHER_TRANSPORT=replay python main.py       # same responses, offline
+
+The mode is picked through Config (see build_transport()).
+"""
+
+import asyncio
+import copy
+import gzip
+import json
+import random
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from config import Config
+
+# Request identity: (endpoint, sorted query parameters without the API key)
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def request_key(request: httpx.Request) -> Key:
+    """Identify a request by endpoint and query, ignoring the API key."""
+    endpoint = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+    params = []
+    for name, value in request.url.params.multi_items():
+        if name == "appid":
+            continue
+        if name == "q":
+            value = " ".join(value.casefold().split())
+        params.append((name, value))
+    return endpoint, tuple(sorted(params))
+
+
+def fake_city_id(name: str) -> int:
+    """Stable made-up city ID for a name missing from the cassette."""
+    return zlib.crc32(name.casefold().encode()) % 10_000_000
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Send requests to the network and append every response to a cassette."""
+
+    def __init__(self, path: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            path: Cassette file; new responses are appended to it
+            inner: Transport doing the real work (defaults to a pooled
+                network transport using the Config pool settings)
+        """
+        self.path = path
+        self.inner = inner or httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=Config.MAX_CONNECTIONS,
+                max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.KEEPALIVE_EXPIRY,
+            ),
+        )
+        self._file = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        latency = time.perf_counter() - start
+
+        endpoint, params = request_key(request)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = body.decode("utf-8", "replace")
+        self._write({
+            "endpoint": endpoint,
+            "params": dict(params),
+            "status": response.status_code,
+            "latency": round(latency, 4),
+            "body": data,
+        })
+
+        # The body is already decoded, so drop the headers describing the
+        # encoded one
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code, headers=headers, content=body, request=request
+        )
+
+    def _write(self, entry: Dict):
+        if self._file is None:
+            # Appending adds a gzip member; readers see one continuous stream
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    async def aclose(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Answer requests from a cassette, without network.
+
+    A request recorded several times is answered with each recording in
+    turn, so a cassette captured over a day replays the changing weather.
+    Requests missing from the cassette can be "fanned out": they get a
+    recorded response of the same endpoint, picked by a hash of the query
+    and renamed to the requested city, which turns a small cassette into
+    thousands of distinct cities.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        latency: Optional[float] = None,
+        jitter: float = 0.0,
+        loop: bool = True,
+        fan_out: bool = True,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: Cassette file
+            latency: Seconds to wait before each response; None replays
+                the latency measured while recording
+            jitter: Spread of a log-normal factor applied to the latency
+            loop: Start over once every recording of a request was served
+                (otherwise the last one keeps being served)
+            fan_out: Answer unknown cities from other recorded responses
+                (otherwise they get a 404)
+            seed: Seed for reproducible jitter
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.loop = loop
+        self.fan_out = fan_out
+        self.random = random.Random(seed)
+        self.requests = 0
+
+        self.recordings: Dict[Key, List[Dict]] = defaultdict(list)
+        self.by_endpoint: Dict[str, List[Dict]] = defaultdict(list)
+        self.by_city_id: Dict[int, Dict] = {}
+        self._served: Dict[Key, int] = defaultdict(int)
+        self._load(path)
+
+    def _load(self, path: str):
+        """
+        Read a cassette, keeping what was recorded before any damage.
+
+        A recorder that was killed leaves a gzip stream without its end
+        marker (and maybe half a line); everything before that point is
+        replayed.
+        """
+        count = 0
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # cut off mid-write
+                    if line.strip():
+                        self._add(json.loads(line))
+                        count += 1
+            except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+                print(
+                    f"Cassette {path} is truncated ({e}); "
+                    f"replaying its first {count} responses"
+                )
+
+    def _add(self, entry: Dict):
+        key = (entry["endpoint"], tuple(sorted(entry["params"].items())))
+        self.recordings[key].append(entry)
+        if entry["status"] != 200:
+            return
+
+        self.by_endpoint[entry["endpoint"]].append(entry)
+        body = entry["body"]
+        if entry["endpoint"] == "weather":
+            self.by_city_id[body["id"]] = body
+        elif entry["endpoint"] == "group":
+            for item in body.get("list", []):
+                self.by_city_id[item["id"]] = item
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        key = request_key(request)
+        entry = self._pick(key)
+
+        if entry is None:
+            status, body, latency = 404, {"cod": "404", "message": "city not found"}, 0.0
+        else:
+            status, body, latency = entry["status"], entry["body"], entry["latency"]
+
+        delay = latency if self.latency is None else self.latency
+        if self.jitter:
+            delay *= self.random.lognormvariate(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if isinstance(body, str):
+            return httpx.Response(status, text=body, request=request)
+        return httpx.Response(status, json=body, request=request)
+
+    def _pick(self, key: Key) -> Optional[Dict]:
+        """Find the response for a request, fanning out when allowed."""
+        recordings = self.recordings.get(key)
+        if recordings:
+            n = self._served[key]
+            self._served[key] += 1
+            index = n % len(recordings) if self.loop else min(n, len(recordings) - 1)
+            return recordings[index]
+
+        if not self.fan_out:
+            return None
+        endpoint, params = key
+        params = dict(params)
+        if endpoint == "group":
+            return self._fan_out_group(params.get("id", ""))
+        candidates = self.by_endpoint.get(endpoint)
+        if not candidates:
+            return None
+
+        query = params.get("q") or params.get("id") or f"{params.get('lat')},{params.get('lon')}"
+        entry = candidates[zlib.crc32(query.encode()) % len(candidates)]
+        body = copy.deepcopy(entry["body"])
+        name = params["q"].split(",")[0].title() if "q" in params else None
+        city_id = int(params["id"]) if params.get("id", "").isdigit() else fake_city_id(query)
+        if endpoint == "weather":
+            body["id"] = city_id
+            body["name"] = name or body.get("name")
+        elif endpoint == "forecast" and "city" in body:
+            body["city"]["id"] = city_id
+            body["city"]["name"] = name or body["city"].get("name")
+        return {**entry, "body": body}
+
+    def _fan_out_group(self, ids: str) -> Optional[Dict]:
+        """Build a group response from recorded cities, renumbering unknown ones."""
+        items = []
+        known = list(self.by_city_id.values())
+        for part in ids.split(","):
+            if not part.strip().isdigit():
+                continue
+            city_id = int(part)
+            item = self.by_city_id.get(city_id)
+            if item is None:
+                if not known:
+                    continue
+                item = dict(known[city_id % len(known)], id=city_id)
+            items.append(item)
+        if not items:
+            return None
+        latencies = [e["latency"] for e in self.by_endpoint.get("group", [])]
+        latency = sum(latencies) / len(latencies) if latencies else 0.0
+        return {
+            "status": 200,
+            "latency": latency,
+            "body": {"cnt": len(items), "list": items},
+        }
+
+
+def build_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Build the transport selected by Config.TRANSPORT.
+
+    Returns:
+        None for "live" (the default network transport), otherwise a
+        RecordingTransport or ReplayTransport on Config.CASSETTE_FILE
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = Config.TRANSPORT
+    if mode == "live":
+        return None
+    if mode == "record":
+        return RecordingTransport(Config.CASSETTE_FILE)
+    if mode == "replay":
+        return ReplayTransport(
+            Config.CASSETTE_FILE,
+            latency=Config.REPLAY_LATENCY,
+            jitter=Config.REPLAY_JITTER,
+            loop=Config.REPLAY_LOOP,
+            fan_out=Config.REPLAY_FAN_OUT,
+        )
+    raise ValueError(
+        f"Unknown WEATHER_TRANSPORT '{mode}' (expected live, record or replay)"
+    )
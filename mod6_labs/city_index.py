@@ -0,0 +1,266 @@
+"""
+Local city index for type-ahead suggestions.
+
+Cities come from OpenWeatherMap's bulk city list (name, state, country,
+ID, coordinates). The list is large, so it is loaded lazily, on the first
+suggestion, into two parallel sorted lists searched with bisect: folded
+names (lower case, accents removed) and the raw rows they belong to, plus
+the positions of each state's and country's rows for narrowing by region.
+Rows are only parsed for the handful of cities returned, which keeps a
+lookup well under a millisecond.
+
+No data ships with the app. Build the index once with
+
+    python city_index.py                    # downloads the city list
+    python city_index.py city.list.json.gz  # or converts a local copy
+
+which writes Config.CITY_INDEX_FILE. The city list itself
+(city.list.json or city.list.json.gz) can be used as the index file too;
+it just takes longer to load.
+"""
+
+import asyncio
+import bisect
+import gzip
+import heapq
+import json
+import sys
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from config import Config
+
+
+class City(NamedTuple):
+    """One entry of the city index."""
+    city_id: int
+    name: str
+    state: str  # US state code, empty elsewhere
+    country: str
+    lat: float
+    lon: float
+
+    @property
+    def label(self) -> str:
+        """Text shown in the search field, e.g. "Paris, FR"."""
+        parts = [self.name, self.state, self.country]
+        return ", ".join(part for part in parts if part)
+
+    @property
+    def coordinates(self) -> str:
+        """Latitude and longitude, telling apart cities with the same label."""
+        return f"{self.lat:.2f}, {self.lon:.2f}"
+
+
+def fold(text: str) -> str:
+    """Normalize text for matching: lower case, no accents or outer spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
+def _open(path: Path):
+    return gzip.open(path, "rt", encoding="utf-8") if path.suffix == ".gz" else open(
+        path, encoding="utf-8"
+    )
+
+
+def _rows_from_city_list(path: Path) -> List[Tuple[str, str]]:
+    """Read OpenWeatherMap's city.list.json(.gz) as sorted (key, row) pairs."""
+    with _open(path) as f:
+        cities = json.load(f)
+    rows = []
+    for city in cities:
+        name = (city.get("name") or "").replace("\t", " ").strip()
+        if not name:
+            continue
+        coord = city.get("coord", {})
+        row = "\t".join((
+            name,
+            city.get("state") or "",
+            city.get("country") or "",
+            str(city["id"]),
+            str(coord.get("lat", 0.0)),
+            str(coord.get("lon", 0.0)),
+        ))
+        rows.append((fold(name), row))
+    rows.sort()
+    return rows
+
+
+def write_index(rows: Iterable[Tuple[str, str]], path: Path):
+    """Write sorted (key, row) pairs as a gzipped TSV index, atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        for key, row in rows:
+            f.write(f"{key}\t{row}\n")
+    tmp.replace(path)
+
+
+class CityIndex:
+    """Prefix search over city names, loaded from disk on first use."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Index built by this module (.tsv.gz), or OpenWeatherMap's
+                city.list.json(.gz)
+        """
+        self.path = Path(path)
+        self.keys: List[str] = []  # folded names, sorted
+        self.rows: List[str] = []  # "name\tstate\tcountry\tid\tlat\tlon", same order
+        self.regions: Dict[str, array] = {}  # folded state/country -> row positions
+        self.loaded = False
+        self._loading: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        """Whether there is an index to load (or one was loaded)."""
+        return self.loaded or self.path.exists()
+
+    def load(self):
+        """
+        Read the index (blocking; see ensure_loaded()).
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a valid index or city list
+        """
+        if self.path.name.endswith((".json", ".json.gz")):
+            pairs = _rows_from_city_list(self.path)
+            keys = [key for key, _ in pairs]
+            rows = [row for _, row in pairs]
+        else:
+            keys, rows = [], []
+            with _open(self.path) as f:
+                for line in f:
+                    key, row = line.rstrip("\n").split("\t", 1)
+                    keys.append(key)
+                    rows.append(row)
+            if keys != sorted(keys):
+                raise ValueError(f"{self.path} is not sorted; rebuild it with city_index.py")
+        regions: Dict[Tuple[str, str], List[array]] = {}  # (state, country) -> lists
+        by_name: Dict[str, array] = {}
+        for i, row in enumerate(rows):
+            _, state, country, _ = row.split("\t", 3)
+            lists = regions.get((state, country))
+            if lists is None:
+                # Few distinct pairs, so each is folded only once
+                lists = regions[(state, country)] = [
+                    by_name.setdefault(region, array("l"))
+                    for region in {fold(state), fold(country)} - {""}
+                ]
+            for positions in lists:
+                positions.append(i)
+        self.keys, self.rows, self.regions = keys, rows, by_name
+        self.loaded = True
+
+    async def ensure_loaded(self) -> bool:
+        """
+        Load the index in a worker thread, once.
+
+        Returns:
+            True if the index can be searched
+        """
+        if self.loaded:
+            return True
+        if not self.path.exists():
+            return False
+        if self._loading is None:
+            self._loading = asyncio.create_task(asyncio.to_thread(self.load))
+        try:
+            await asyncio.shield(self._loading)
+        except (OSError, ValueError) as e:
+            print(f"Could not load the city index: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _parse(row: str) -> City:
+        name, state, country, city_id, lat, lon = row.split("\t")
+        return City(int(city_id), name, state, country, float(lat), float(lon))
+
+    def suggest(self, query: str, limit: int = 8) -> List[City]:
+        """
+        Cities whose name starts with the query, in alphabetical order.
+
+        Text after a comma narrows the results down by state or country,
+        e.g. "london, ca". Only rows of matching regions are looked at, so
+        a region that matches nothing costs nothing.
+        """
+        name, *rest = query.split(",")
+        prefix = fold(name)
+        regions = [fold(part) for part in rest if fold(part)]
+        if not prefix or not self.loaded:
+            return []
+
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\uffff", start)
+        positions = self._in_region(regions[0], start, end) if regions else range(start, end)
+        results: List[City] = []
+        for i in positions:
+            city = self._parse(self.rows[i])
+            if not all(
+                fold(city.state).startswith(region) or fold(city.country).startswith(region)
+                for region in regions[1:]
+            ):
+                continue
+            results.append(city)
+            if len(results) == limit:
+                break
+        return results
+
+    def _in_region(self, region: str, start: int, end: int) -> Iterator[int]:
+        """Positions in [start, end) of rows whose state or country starts with ``region``."""
+        ranges = []
+        for name, positions in self.regions.items():
+            if name.startswith(region):
+                lo = bisect.bisect_left(positions, start)
+                hi = bisect.bisect_left(positions, end, lo)
+                ranges.append(positions[lo:hi])
+        previous = -1
+        for i in heapq.merge(*ranges):
+            if i != previous:  # a row can match by both state and country
+                yield i
+                previous = i
+
+    def find(self, label: str) -> Optional[City]:
+        """
+        The city shown as ``label`` in the suggestions, if loaded.
+
+        Returns None when several cities share the label, since the text
+        alone does not say which one is meant.
+        """
+        if not self.loaded:
+            return None
+        key = fold(label.split(",")[0])
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_right(self.keys, key, start)
+        matches = [
+            city for city in map(self._parse, self.rows[start:end])
+            if fold(city.label) == fold(label)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+
+async def _build(source: Optional[str]):
+    if source is None:
+        source_path = Path(Config.CITY_INDEX_FILE).with_name("city.list.json.gz")
+        print(f"Downloading {Config.CITY_LIST_URL}")
+        async with httpx.AsyncClient(timeout=120, follow_redirects=True) as client:
+            response = await client.get(Config.CITY_LIST_URL)
+            response.raise_for_status()
+        source_path.write_bytes(response.content)
+    else:
+        source_path = Path(source)
+    rows = await asyncio.to_thread(_rows_from_city_list, source_path)
+    await asyncio.to_thread(write_index, rows, Path(Config.CITY_INDEX_FILE))
+    print(f"{len(rows)} cities written to {Config.CITY_INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_build(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -3,6 +3,8 @@
 import os
 from dotenv import load_dotenv
 
+from units import check_units
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -15,6 +17,11 @@ class Config:
         "OPENWEATHER_BASE_URL", 
         "https://api.openweathermap.org/data/2.5/weather"
     )
+    # The other endpoints live next to BASE_URL, so pointing it at the
+    # weather proxy (weather_proxy.py) routes every lookup through it
+    API_ROOT = BASE_URL.rstrip("/").rsplit("/", 1)[0]
+    FORECAST_URL = os.getenv("OPENWEATHER_FORECAST_URL", f"{API_ROOT}/forecast")
+    GROUP_URL = os.getenv("OPENWEATHER_GROUP_URL", f"{API_ROOT}/group")
     
     # App Configuration
     APP_TITLE = "Weather App"
@@ -22,22 +29,133 @@ class Config:
     APP_HEIGHT = 600
    
     # API Settings
-    UNITS = "metric"  # metric, imperial, or standard
+    # Units shown at startup: metric, imperial or standard. Data is always
+    # fetched in metric and converted for display (see units.py)
+    UNITS = os.getenv("WEATHER_UNITS", "metric").lower()
     TIMEOUT = 10  # seconds
 
+    # Connection pool settings (shared by every WeatherService request)
+    MAX_CONNECTIONS = int(os.getenv("WEATHER_MAX_CONNECTIONS", "20"))
+    MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("WEATHER_MAX_KEEPALIVE", "10"))
+    KEEPALIVE_EXPIRY = float(os.getenv("WEATHER_KEEPALIVE_EXPIRY", "30"))  # seconds
+    HTTP2 = os.getenv("WEATHER_HTTP2", "false").lower() in ("1", "true", "yes")
+
+    # Response cache settings
+    CACHE_MAX_ENTRIES = 256
+    CACHE_TTL_WEATHER = 10 * 60  # current conditions update every ~10 minutes
+    CACHE_TTL_FORECAST = 3 * 60 * 60  # forecasts update every 3 hours
+    CACHE_MAX_STALE = 60 * 60  # how long an expired entry may still be shown
+    DISK_CACHE_FILE = "weather_cache.db"  # stored next to search_history.json
+
+    # Bulk lookups (saved city cards)
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("WEATHER_MAX_CONCURRENT_REQUESTS", "8"))
+    GROUP_BATCH_SIZE = 20  # the group endpoint accepts at most 20 city IDs
+
+    # Resilience: retries, circuit breaker and client-side rate limit
+    RETRY_ATTEMPTS = 3  # total tries per request
+    RETRY_BASE_DELAY = 0.5  # seconds, doubled on every retry (with jitter)
+    RETRY_MAX_DELAY = 8.0  # seconds
+    CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failures before failing fast
+    CIRCUIT_RESET_TIMEOUT = 30.0  # seconds before a trial request is let through
+    RATE_LIMIT_PER_MINUTE = int(os.getenv("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+
+    # Request metrics (counters and latency histograms)
+    METRICS_ENABLED = os.getenv("WEATHER_METRICS", "false").lower() in ("1", "true", "yes")
+    METRICS_FILE = os.getenv("WEATHER_METRICS_FILE", "")  # written on exit; .prom or .json
+
+    # Network transport: "live", "record" (capture responses to the cassette)
+    # or "replay" (answer from the cassette, offline; see cassette.py)
+    TRANSPORT = os.getenv("WEATHER_TRANSPORT", "live").lower()
+    CASSETTE_FILE = os.getenv("WEATHER_CASSETTE", "weather_cassette.ndjson.gz")
+    # Replay latency in ms; empty replays the latency measured while recording
+    REPLAY_LATENCY = (
+        float(os.environ["WEATHER_REPLAY_LATENCY"]) / 1000
+        if os.getenv("WEATHER_REPLAY_LATENCY") else None
+    )
+    REPLAY_JITTER = float(os.getenv("WEATHER_REPLAY_JITTER", "0"))
+    REPLAY_LOOP = os.getenv("WEATHER_REPLAY_LOOP", "true").lower() in ("1", "true", "yes")
+    REPLAY_FAN_OUT = os.getenv("WEATHER_REPLAY_FAN_OUT", "true").lower() in ("1", "true", "yes")
+
+    # Weather proxy server (weather_proxy.py)
+    PROXY_HOST = os.getenv("WEATHER_PROXY_HOST", "127.0.0.1")
+    PROXY_PORT = int(os.getenv("WEATHER_PROXY_PORT", "8000"))
+    PROXY_CACHE_MAX_ENTRIES = int(os.getenv("WEATHER_PROXY_CACHE_ENTRIES", "10000"))
+
+    # Background refresh of saved city cards
+    REFRESH_CADENCE = 10 * 60  # how often the provider publishes a new observation
+    REFRESH_GRACE = 60  # extra wait after the expected observation, in seconds
+    REFRESH_MIN_INTERVAL = 2 * 60  # seconds between refreshes of one city, at least
+    REFRESH_MAX_INTERVAL = 60 * 60  # ...and at most
+    REFRESH_JITTER = 0.1  # +/- share of randomness added to every interval
+    REFRESH_BUDGET_PER_MINUTE = int(os.getenv("WEATHER_REFRESH_PER_MINUTE", "20"))
+
+    # Search history and saved cities files
+    HISTORY_LIMIT = 10  # searches kept in the history dropdown
+    SAVE_DEBOUNCE = 0.5  # seconds to collect changes before writing the files
+
+    # Weather icons (see icon_store.py): remote, cached, preload or inline
+    ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+    ICON_MODE = os.getenv("WEATHER_ICON_MODE", "cached").lower()
+    ICON_MODES = ("remote", "cached", "preload", "inline")
+    ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+
+    # Voice search (see voice.py): "google" (SpeechRecognition) or "offline"
+    VOICE_RECOGNIZER = os.getenv("WEATHER_VOICE_RECOGNIZER", "google").lower()
+    # Phrases "heard" in turn by the offline recognizer, comma-separated
+    VOICE_OFFLINE_PHRASES = [
+        phrase.strip()
+        for phrase in os.getenv("WEATHER_VOICE_PHRASES", "London,Tokyo,Manila").split(",")
+        if phrase.strip()
+    ]
+    VOICE_CONFIRM_DELAY = 2.0  # seconds the recognized text stays on screen
+
+    # City suggestions (see city_index.py); the index is built, not bundled
+    CITY_INDEX_FILE = os.getenv(
+        "WEATHER_CITY_INDEX", os.path.join(os.path.dirname(__file__), "city_index.tsv.gz")
+    )
+    CITY_LIST_URL = "https://bulk.openweathermap.org/sample/city.list.json.gz"
+    SUGGEST_DEBOUNCE = 0.15  # seconds of typing pause before suggesting
+    SUGGEST_LIMIT = 6  # suggestions shown under the search field
+
+    # Predictive prefetch of likely searches (see prefetch.py), off by default
+    PREFETCH_ENABLED = os.getenv("WEATHER_PREFETCH", "false").lower() in ("1", "true", "yes")
+    PREFETCH_HISTORY_ENTRIES = 3  # top history entries warmed, before the saved cities
+    PREFETCH_IDLE_DELAY = 1.0  # seconds without typing before prefetching starts
+    PREFETCH_BUDGET_PER_MINUTE = int(os.getenv("WEATHER_PREFETCH_PER_MINUTE", "12"))
+
     START_SOUND = os.path.join(os.path.dirname(__file__), "sounds", "start.wav")
     END_SOUND = os.path.join(os.path.dirname(__file__), "sounds", "end.wav")
 
     
     @classmethod
     def validate(cls):
-        """Validate that required configuration is present."""
-        if not cls.API_KEY:
+        """
+        Validate that required configuration is present.
+
+        Called by each entry point at startup rather than on import, so
+        importing this module stays cheap and side-effect free (apart from
+        reading .env).
+        """
+        check_units(cls.UNITS)
+        if cls.ICON_MODE not in cls.ICON_MODES:
+            raise ValueError(
+                f"Unknown WEATHER_ICON_MODE '{cls.ICON_MODE}' "
+                f"(expected {', '.join(cls.ICON_MODES)})."
+            )
+        if cls.TRANSPORT not in ("live", "record", "replay"):
+            raise ValueError(
+                f"Unknown WEATHER_TRANSPORT '{cls.TRANSPORT}' "
+                "(expected live, record or replay)."
+            )
+        if cls.TRANSPORT == "replay" and not os.path.exists(cls.CASSETTE_FILE):
+            raise ValueError(
+                f"Cassette '{cls.CASSETTE_FILE}' not found. Record one first "
+                "with WEATHER_TRANSPORT=record, or set WEATHER_CASSETTE."
+            )
+        # Replayed responses need no API key
+        if not cls.API_KEY and cls.TRANSPORT != "replay":
             raise ValueError(
                 "OPENWEATHER_API_KEY not found. "
                 "Please create a .env file with your API key."
             )
         return True
-
-# Validate configuration on import
-Config.validate()
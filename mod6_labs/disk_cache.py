@@ -0,0 +1,84 @@
+"""Persistent on-disk cache of the last weather responses."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class DiskCache:
+    """
+    SQLite store holding the most recent response for each lookup.
+
+    Entries survive restarts, so the app can draw saved cities on the
+    first frame and still show something when the network is down.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the table on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[Dict, float]]:
+        """
+        Read a stored response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (data, fetched_at timestamp), or None if not stored
+        """
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT payload, fetched_at FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+            if row is None:
+                return None
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError):
+            # A broken cache only costs us a network round-trip
+            return None
+
+    def set(self, key: str, data: Dict, fetched_at: Optional[float] = None):
+        """Store a response together with the time it was fetched."""
+        if fetched_at is None:
+            fetched_at = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, payload, fetched_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(data), fetched_at),
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close the database connection. It is reopened on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
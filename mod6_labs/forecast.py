@@ -0,0 +1,99 @@
+"""Daily aggregation of the 5-day / 3-hour forecast."""
+
+import datetime
+from typing import List, Sequence
+
+import numpy as np
+
+from models import DailySummary, Forecast
+
+SECONDS_PER_DAY = 24 * 60 * 60
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def aggregate_daily(forecast: Forecast) -> List[DailySummary]:
+    """
+    Group a forecast into local calendar days.
+
+    Args:
+        forecast: Parsed /forecast response
+
+    Returns:
+        One DailySummary per local day, in chronological order
+    """
+    return aggregate_many([forecast])[0]
+
+
+def aggregate_many(forecasts: Sequence[Forecast]) -> List[List[DailySummary]]:
+    """
+    Group many forecasts into local calendar days in one pass.
+
+    Slots are bucketed by the city's local day (using the forecast's
+    timezone offset) and every statistic is computed with one vectorized
+    reduction over all cities at once.
+
+    Args:
+        forecasts: Parsed /forecast responses
+
+    Returns:
+        For each forecast, its list of DailySummary in chronological order
+    """
+    city_idx, dt, temp, temp_min, temp_max = [], [], [], [], []
+    precip, wind, icon = [], [], []
+
+    for i, forecast in enumerate(forecasts):
+        for slot in forecast.slots:
+            city_idx.append(i)
+            dt.append(slot.dt + forecast.timezone)
+            temp.append(slot.temp)
+            temp_min.append(slot.temp_min)
+            temp_max.append(slot.temp_max)
+            precip.append(slot.precipitation)
+            wind.append(slot.wind_speed)
+            # "10d" -> 10; day/night is dropped so both count as one condition
+            icon.append(int(slot.icon[:2]))
+
+    results: List[List[DailySummary]] = [[] for _ in forecasts]
+    if not city_idx:
+        return results
+
+    # One group per (city, local day); unique() keeps them sorted
+    days = np.asarray(dt, dtype=np.int64) // SECONDS_PER_DAY
+    keys = (np.asarray(city_idx, dtype=np.int64) << 32) | days
+    groups, inverse = np.unique(keys, return_inverse=True)
+    n_groups = len(groups)
+
+    counts = np.bincount(inverse, minlength=n_groups)
+    temp_mean = np.bincount(inverse, weights=temp, minlength=n_groups) / counts
+    precipitation = np.bincount(inverse, weights=precip, minlength=n_groups)
+    wind = np.asarray(wind, dtype=float)
+    wind_mean = np.bincount(inverse, weights=wind, minlength=n_groups) / counts
+
+    daily_min = np.full(n_groups, np.inf)
+    np.minimum.at(daily_min, inverse, np.asarray(temp_min, dtype=float))
+    daily_max = np.full(n_groups, -np.inf)
+    np.maximum.at(daily_max, inverse, np.asarray(temp_max, dtype=float))
+    wind_max = np.zeros(n_groups)
+    np.maximum.at(wind_max, inverse, wind)
+
+    # Dominant icon: count (group, icon) pairs, keep the most frequent per group
+    pairs, pair_counts = np.unique(inverse * 100 + np.asarray(icon), return_counts=True)
+    pair_groups = pairs // 100
+    order = np.lexsort((-pair_counts, pair_groups))
+    _, first = np.unique(pair_groups[order], return_index=True)
+    dominant_icon = pairs[order][first] % 100
+
+    for g in range(n_groups):
+        results[int(groups[g] >> 32)].append(
+            DailySummary(
+                date=EPOCH + datetime.timedelta(days=int(groups[g] & 0xFFFFFFFF)),
+                temp_min=float(daily_min[g]),
+                temp_max=float(daily_max[g]),
+                temp_mean=float(temp_mean[g]),
+                icon=f"{int(dominant_icon[g]):02d}d",
+                precipitation=float(precipitation[g]),
+                wind_mean=float(wind_mean[g]),
+                wind_max=float(wind_max[g]),
+            )
+        )
+    return results
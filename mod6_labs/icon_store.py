@@ -0,0 +1,188 @@
+"""
+Local copies of the OpenWeatherMap weather icons.
+
+The app shows the same 18 small PNGs over and over. Instead of pointing
+every image at the OpenWeatherMap CDN, icons are kept under assets/icons/
+and served by Flet as app assets. Config.ICON_MODE picks the strategy:
+
+- "remote": always load from the CDN (previous behaviour)
+- "cached": serve local copies, downloading missing ones in the background
+  the first time they are needed (default)
+- "preload": like "cached", but download the whole set at startup
+- "inline": preload the whole set into memory and embed the images as
+  base64, so cards render without any image request at all
+
+To ship the icons with the app, download them once before packaging:
+
+    python icon_store.py
+"""
+
+import asyncio
+import base64
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+import flet as ft
+import httpx
+
+from config import Config
+
+ICON_CODES = tuple(
+    f"{number}{time_of_day}"
+    for number in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for time_of_day in ("d", "n")
+)
+MODES = Config.ICON_MODES
+
+
+class IconStore:
+    """Serves weather icons from the app assets, fetching them when missing."""
+
+    def __init__(self, assets_dir: Path, mode: str = "cached"):
+        """
+        Args:
+            assets_dir: Flet assets directory; icons go to its icons/ folder
+            mode: One of MODES
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown icon mode '{mode}' (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.directory = Path(assets_dir) / "icons"
+        self._available: Set[str] = set()
+        self._inline: Dict[str, str] = {}  # code -> base64 PNG
+        self._downloads: Dict[str, asyncio.Task] = {}
+        self._scan()
+
+    def _scan(self):
+        """Find the icons already on disk."""
+        if self.directory.is_dir():
+            self._available = {
+                path.name.removesuffix("@2x.png") for path in self.directory.glob("*@2x.png")
+            }
+
+    @staticmethod
+    def remote_url(code: str) -> str:
+        return Config.ICON_URL.format(code=code)
+
+    def path(self, code: str) -> Path:
+        return self.directory / f"{code}@2x.png"
+
+    def apply(self, image: ft.Image, code: str):
+        """
+        Point an image at an icon.
+
+        Uses the embedded copy in "inline" mode, the asset when it is on
+        disk, and the CDN otherwise (queuing a download unless the mode is
+        "remote").
+        """
+        inline = self._inline.get(code)
+        if inline is not None:
+            image.src, image.src_base64 = None, inline
+            return
+
+        image.src_base64 = None
+        if self.mode != "remote" and code in self._available:
+            # Flet resolves paths starting with "/" against the assets directory
+            image.src = f"/icons/{code}@2x.png"
+            return
+
+        image.src = self.remote_url(code)
+        if self.mode != "remote":
+            self._download_later(code)
+
+    def _download_later(self, code: str):
+        """Start a background download of one icon, once."""
+        if code in self._downloads or code not in ICON_CODES:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # not on the event loop; the next call from it will do
+        task = loop.create_task(self.download([code]))
+        self._downloads[code] = task
+        task.add_done_callback(lambda _: self._downloads.pop(code, None))
+
+    async def download(
+        self, codes: Iterable[str] = ICON_CODES, client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Download icons that are not on disk yet.
+
+        Failures are printed and skipped; the CDN URL keeps being used for
+        those icons.
+        """
+        missing = [code for code in codes if code not in self._available]
+        if not missing:
+            return
+
+        own_client = client is None
+        client = client or httpx.AsyncClient(timeout=Config.TIMEOUT)
+        try:
+            await asyncio.gather(*(self._download_one(client, code) for code in missing))
+        finally:
+            if own_client:
+                await client.aclose()
+
+    async def _download_one(self, client: httpx.AsyncClient, code: str):
+        try:
+            response = await client.get(self.remote_url(code))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Could not download icon {code}: {e}")
+            return
+        if not response.headers.get("content-type", "").startswith("image/"):
+            print(f"Could not download icon {code}: not an image")
+            return
+
+        await asyncio.to_thread(self._save, code, response.content)
+        self._available.add(code)
+
+    def _save(self, code: str, data: bytes):
+        """Write an icon atomically, so a half-written file is never served."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.path(code).with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(self.path(code))
+
+    async def preload(self):
+        """
+        Prepare the whole icon set for the "preload" and "inline" modes.
+
+        Downloads the missing icons and, in "inline" mode, loads every icon
+        into memory. Does nothing in the other modes.
+        """
+        if self.mode not in ("preload", "inline"):
+            return
+        await self.download()
+        if self.mode == "inline":
+            self._inline = await asyncio.to_thread(self._read_all)
+
+    def _read_all(self) -> Dict[str, str]:
+        return {
+            code: base64.b64encode(self.path(code).read_bytes()).decode("ascii")
+            for code in sorted(self._available)
+        }
+
+
+_icons: Optional[IconStore] = None
+
+
+def icons() -> IconStore:
+    """
+    The store shared by every view of the app.
+
+    Created on first use rather than on import, so that an unknown
+    WEATHER_ICON_MODE is reported by Config.validate() first.
+    """
+    global _icons
+    if _icons is None:
+        _icons = IconStore(Config.ASSETS_DIR, Config.ICON_MODE)
+    return _icons
+
+
+if __name__ == "__main__":
+    asyncio.run(IconStore(Config.ASSETS_DIR).download())
+    print(f"{len(list(icons.directory.glob('*@2x.png')))} icons in {icons.directory}")
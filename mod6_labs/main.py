@@ -1,16 +1,34 @@
 """Weather Application using Flet v0.28.3"""
 
+import startup_timeline  # first, so its clock starts before the other imports
 import flet as ft
 from weather_service import WeatherService
+from forecast import aggregate_daily
+from models import CurrentWeather, DailySummary
+from icon_store import icons
+from persistence import JsonStore
+from voice import VoicePipeline, create_recognizer, play_sound
+from refresh_scheduler import RefreshScheduler
+from prefetch import Prefetcher
+from city_index import City, CityIndex
+from units import TEMPERATURE_SYMBOLS, next_units
+from loop_watchdog import install as install_watchdog, watch
+from views import (
+    CityCardRegistry, CurrentWeatherView, ForecastView, fade_in,
+)
 from config import Config
 from pathlib import Path
-import json
-import datetime
+from typing import List, Optional
+from collections import Counter
 import asyncio
-import speech_recognition as sr
-import threading
-import winsound
-import time
+
+startup_timeline.mark("imports done")
+
+# The speech recognizer (speech_recognition) is created on the first mic
+# click: it is slow to load and not available on every platform
+
+CITY_CARD_HEIGHT = 76  # saved city card (70) plus the column spacing (6)
+
 
 class WeatherApp:
     """Main Weather Application class."""
@@ -20,20 +38,35 @@ class WeatherApp:
         self.weather_service = WeatherService()
 
         # Search history
-        self.history_file = Path("search_history.json")
+        self.history_store = JsonStore(Path("search_history.json"), debounce=Config.SAVE_DEBOUNCE)
         self.search_history = self.load_history()
 
-        self.cities_file = Path("cities.json")
+        # City suggestions, loaded from the local index on the first keystroke
+        self.city_index = CityIndex(Config.CITY_INDEX_FILE)
+        self.selected_city: Optional[City] = None
+        self.suggest_task: Optional[asyncio.Task] = None
+
+        self.cities_store = JsonStore(Path("cities.json"), debounce=Config.SAVE_DEBOUNCE)
         self.saved_cities = self.load_cities()
+        self.refresh_scheduler = RefreshScheduler(
+            self.weather_service, self.show_city_card, on_flush=self.flush_city_cards
+        )
+        # Warms likely searches while idle (opt-in, WEATHER_PREFETCH)
+        self.prefetcher = (
+            Prefetcher(self.weather_service, self.resolve_city_id)
+            if Config.PREFETCH_ENABLED else None
+        )
 
         self.setup_page()
         self.build_ui()
+        self.city_cards = CityCardRegistry(self.page, self.cities_column, self.remove_city)
+        startup_timeline.mark("first page.update")
 
-        self.page.run_task(self.load_saved_city_cards)
+        self.page.on_close = self.on_app_close
+        self.page.on_app_lifecycle_state_change = self.on_lifecycle_change
+        self.page.run_task(self.on_app_start)
 
-        self.recognizer = sr.Recognizer()
-        self.mic_stream = None
-        self.listening = False
+        self.voice: Optional[VoicePipeline] = None  # created on the first mic click
 
     def setup_page(self):
         """Configure page settings."""
@@ -71,6 +104,13 @@ class WeatherApp:
             on_click=self.toggle_theme,
         )
 
+        # Unit toggle: cycles through °C, °F and K without refetching
+        self.units_button = ft.TextButton(
+            TEMPERATURE_SYMBOLS[Config.UNITS],
+            tooltip="Switch units",
+            on_click=self.toggle_units,
+        )
+
         # Microphone search button
         self.mic_button = ft.IconButton(
             icon=ft.Icons.MIC,
@@ -87,7 +127,7 @@ class WeatherApp:
             autofocus=True,
             expand=True,
             on_submit=self.on_search,
-            on_change=self.show_history,
+            on_change=self.on_query_change,
             on_blur=self.hide_history,
         )
 
@@ -105,23 +145,9 @@ class WeatherApp:
             on_click=self.on_search
         )
 
-        self.temperature_text = ft.Text()
-        
-        # Weather display container
-        self.weather_container = ft.Container(
-            bgcolor=ft.Colors.BLUE_50,
-            border_radius=10,
-            padding=20,
-            visible=False
-        )
-
-        # Forecast display container
-        self.forecast_container = ft.Container(
-            bgcolor=ft.Colors.BLUE_50,
-            border_radius=10,
-            padding=20,
-            visible=False,
-        )
+        # Weather display, built once and updated for every search
+        self.weather_container = CurrentWeatherView()
+        self.temperature_text = self.weather_container.temperature_text
         
         # Error message
         self.error_message = ft.Text(
@@ -133,7 +159,9 @@ class WeatherApp:
         
         self.cities_column = ft.Column(
             spacing=6,
-            scroll=ft.ScrollMode.ALWAYS
+            scroll=ft.ScrollMode.ALWAYS,
+            on_scroll=self.on_cities_scroll,
+            on_scroll_interval=250,
         )
 
         self.cities_container = ft.Container(
@@ -145,11 +173,14 @@ class WeatherApp:
             bgcolor=ft.Colors.WHITE
         )
 
+        # Saved cities and forecast display, built once as well
+        self.forecast_container = ForecastView(self.cities_container, self.open_add_city_dialog)
+
         # Update the Column to include the theme button in the title row
         title_row = ft.Row(
             [
                 self.title,
-                self.theme_button,
+                ft.Row([self.units_button, self.theme_button], spacing=0),
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
         )
@@ -227,126 +258,106 @@ class WeatherApp:
             )
         )
 
-    async def on_app_start(self, e):
-        asyncio.create_task(self.load_saved_city_cards())
+    async def on_app_start(self):
+        """Open the shared HTTP connection pool, then load saved city cards."""
+        await self.weather_service.start()
+
+        # Inline icons must be in memory before the first cards are drawn;
+        # in "preload" mode the set is downloaded in the background
+        if icons().mode == "inline":
+            await icons().preload()
+        else:
+            self.icon_preload = asyncio.create_task(icons().preload())
+
+        await self.load_saved_city_cards()
+        startup_timeline.finish("saved cities loaded")
+
+        # Keep the cards fresh from now on, starting with the ones on screen
+        # (cards were added in the order their data arrived, not saved order)
+        rows = int(self.cities_container.height // CITY_CARD_HEIGHT) + 1
+        self.refresh_scheduler.set_visible(self.city_cards.keys_in_rows(0, rows - 1))
+        self.refresh_scheduler.start()
+        self.prefetch_likely()
+
+    async def on_app_close(self, e):
+        """Save pending changes and release the HTTP connection pool."""
+        await self.refresh_scheduler.stop()
+        if self.prefetcher:
+            self.prefetcher.cancel()
+            print(self.prefetcher.report())
+        if self.voice:
+            self.voice.close()
+        self.history_store.flush()
+        self.cities_store.flush()
+        if Config.METRICS_FILE:
+            self.weather_service.write_metrics(Config.METRICS_FILE)
+        await self.weather_service.close()
+
+    @watch
+    def on_lifecycle_change(self, e: ft.AppLifecycleStateChangeEvent):
+        """Pause background refreshes while the window is hidden."""
+        if e.state in (ft.AppLifecycleState.HIDE, ft.AppLifecycleState.PAUSE):
+            self.refresh_scheduler.pause()
+        elif e.state in (ft.AppLifecycleState.SHOW, ft.AppLifecycleState.RESUME):
+            self.refresh_scheduler.resume()
+
+    @watch
+    def on_cities_scroll(self, e: ft.OnScrollEvent):
+        """Tell the refresh scheduler which saved city cards are on screen."""
+        first = int(e.pixels // CITY_CARD_HEIGHT)
+        last = int((e.pixels + e.viewport_dimension) // CITY_CARD_HEIGHT)
+        self.refresh_scheduler.set_visible(self.city_cards.keys_in_rows(first, last))
 
     
     def load_cities(self):
         """Load saved cities from JSON file."""
-        if self.cities_file.exists():
-            with open(self.cities_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return []
-        return []
+        return self.cities_store.load()
 
     async def load_saved_city_cards(self):
-        """Fetch weather for saved cities and add cards to UI."""
+        """Draw saved city cards from the cache, then refresh them live."""
+        # First frame: last known data, without waiting on the network
         for city in self.saved_cities:
-            try:
-                data = await self.weather_service.get_weather(city)
-                city_name = data.get("name", "Unknown")
-                country = data.get("sys", {}).get("country", "")
-
-                icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-
-                temp = data.get("main", {}).get("temp", 0)
-
-                min_temp = data.get("main", {}).get("temp_min", 0)
-                max_temp = data.get("main", {}).get("temp_max", 0)
-                self.add_city_card(city_name, country, icon_code, temp, min_temp, max_temp)
-            except Exception as e:
-                print(f"Failed to load {city}: {e}")
-
-    def add_city_card(self, city_name, country, icon_code, temp, min_temp, max_temp):
-        card = ft.Container(
-            padding=10,
-            border_radius=10,
-            bgcolor=ft.Colors.WHITE,
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=3,
-                color=ft.Colors.with_opacity(0.15, ft.Colors.BLACK),
-            ),
-            content=ft.Row(
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=15,
-                controls=[
-
-                    # Left side: Weather icon
-                    ft.Image(
-                        src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
-                        width=50,
-                        height=50,
-                    ),
-
-                    # City + Country
-                    ft.Text(
-                        f"{city_name}, {country}",
-                        size=16,
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.GREY_800,
-                    ),
-
-                    # Current Temp
-                    ft.Text(
-                        f"{temp:.1f}°C",
-                        size=16,
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.BLUE_700,
-                    ),
-
-                    # Min Temp with Down Arrow
-                    ft.Row(
-                        spacing=2,
-                        controls=[
-                            ft.Icon(ft.Icons.ARROW_DOWNWARD, size=16, color=ft.Colors.BLUE_500),
-                            ft.Text(f"{min_temp:.1f}°C", size=12, color=ft.Colors.GREY_600),
-                        ]
-                    ),
-
-                    # Max Temp with Up Arrow
-                    ft.Row(
-                        spacing=2,
-                        controls=[
-                            ft.Icon(ft.Icons.ARROW_UPWARD, size=16, color=ft.Colors.BLUE_500),
-                            ft.Text(f"{max_temp:.1f}°C", size=12, color=ft.Colors.GREY_600),
-                        ]
-                    ),
-
-                    # Delete button
-                    ft.IconButton(
-                        icon=ft.Icons.DELETE,
-                        icon_size=22,
-                        icon_color=ft.Colors.RED_600,
-                        tooltip="Remove city",
-                        on_click=lambda e: self.remove_city(city_name, card),
-                    )
-                ]
-            )
-        )
-
-        self.cities_column.controls.append(card)
-        self.page.update()
-
+            weather = await self.weather_service.get_cached_weather(city)
+            if weather:
+                self.show_city_card(city, weather)
+        self.flush_city_cards()
+
+        # Then refresh them concurrently and send all changes at once
+        results = self.weather_service.get_weather_many(self.saved_cities)
+        async for city, weather, error in results:
+            if error:
+                print(f"Failed to load {city}: {error}")
+            else:
+                self.show_city_card(city, weather)
+            self.refresh_scheduler.add(city, weather)
+        self.flush_city_cards()
+
+    def show_city_card(self, city: str, weather: CurrentWeather):
+        """Add or update the card of a saved city (sent by flush_city_cards)."""
+        self.city_cards.show(city, weather)
+
+    def flush_city_cards(self):
+        """Send pending card changes to the client in one update."""
+        self.city_cards.flush()
 
     def save_cities(self):
-        """Save search history to file."""
-        with open(self.cities_file, 'w') as f:
-            json.dump(self.saved_cities, f)
+        """Save saved cities to file (written in the background)."""
+        self.cities_store.save(self.saved_cities)
 
-    def remove_city(self, city_name: str, card):
-        # Remove from UI
-        self.cities_column.controls.remove(card)
-        self.page.update()
+    @watch
+    def remove_city(self, city_name: str):
+        # Remove from UI, with any other saved name showing the same city
+        removed = self.city_cards.remove(city_name)
+        self.flush_city_cards()
 
         # Remove from JSON
-        if city_name in self.saved_cities:
-            self.saved_cities.remove(city_name)
-            self.save_cities()
+        for key in removed:
+            self.refresh_scheduler.remove(key)
+            if key in self.saved_cities:
+                self.saved_cities.remove(key)
+        self.save_cities()
 
+    @watch
     def open_add_city_dialog(self, e):
         # Text input for city
         self.city_input_dialog = ft.TextField(
@@ -394,17 +405,7 @@ class WeatherApp:
 
         # Fetch weather data (your existing method)
         try:
-            data = await self.weather_service.get_weather(city)
-
-            city_name = data.get("name", "Unknown")
-            country = data.get("sys", {}).get("country", "")
-
-            icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-
-            temp = data.get("main", {}).get("temp", 0)
-
-            min_temp = data.get("main", {}).get("temp_min", 0)
-            max_temp = data.get("main", {}).get("temp_max", 0)
+            weather = await self.weather_service.get_weather(city)
 
         except Exception as e:
             # Show error message if city not found
@@ -414,7 +415,9 @@ class WeatherApp:
             return
 
         # Add city card to UI
-        self.add_city_card(city_name, country, icon_code, temp, min_temp, max_temp)
+        self.show_city_card(city, weather)
+        self.flush_city_cards()
+        self.refresh_scheduler.add(city, weather)
 
         # Save to JSON
         if city not in self.saved_cities:
@@ -424,6 +427,66 @@ class WeatherApp:
         # Close dialog
         self.close_dialog()
 
+    @watch
+    async def on_query_change(self, e):
+        """Suggest cities (or show the history) once typing pauses."""
+        query = self.city_input.value or ""
+        if self.selected_city and query != self.selected_city.label:
+            self.selected_city = None
+        if self.suggest_task:
+            self.suggest_task.cancel()
+        if self.prefetcher and query.strip():
+            self.prefetcher.cancel()  # the user is after something else
+        self.suggest_task = asyncio.create_task(self.show_suggestions(query))
+
+    async def show_suggestions(self, query: str):
+        """Fill the dropdown with cities from the local index."""
+        await asyncio.sleep(Config.SUGGEST_DEBOUNCE)
+        if not query.strip():
+            self.show_history(None)
+            self.prefetch_likely()
+            return
+        if not await self.city_index.ensure_loaded():
+            self.show_history(None)
+            return
+
+        cities = self.city_index.suggest(query, Config.SUGGEST_LIMIT)
+        # Cities sharing a label are told apart by their coordinates
+        labels = Counter(city.label for city in cities)
+        self.history_dropdown.content.controls = [
+            ft.ListTile(
+                title=ft.Text(city.label),
+                subtitle=ft.Text(city.coordinates) if labels[city.label] > 1 else None,
+                dense=True,
+                on_click=lambda e, c=city: self.select_suggestion(c),
+            )
+            for city in cities
+        ]
+        self.history_dropdown.visible = bool(cities)
+        self.history_dropdown.update()
+
+    @watch
+    def select_suggestion(self, city: City):
+        """Search for a suggested city by its ID."""
+        self.selected_city = city
+        self.city_input.value = city.label
+        self.history_dropdown.visible = False
+        self.page.update()
+        self.on_search(None)
+
+    def prefetch_likely(self):
+        """Warm the top history entries and saved cities while idle (if enabled)."""
+        if self.prefetcher:
+            self.prefetcher.schedule(
+                self.search_history[:Config.PREFETCH_HISTORY_ENTRIES] + self.saved_cities
+            )
+
+    def resolve_city_id(self, city: str) -> Optional[int]:
+        """ID a search for this text is made by, if it names an indexed city."""
+        found = self.city_index.find(city)
+        return found.city_id if found else None
+
+    @watch
     def show_history(self, e):
         # Do NOT show dropdown if history is empty
         if not self.search_history:
@@ -436,10 +499,10 @@ class WeatherApp:
         self.history_dropdown.visible = True
         self.page.update()
 
-    def hide_history(self, e):
+    @watch
+    async def hide_history(self, e):
         # Small delay so clicking history doesn't instantly hide
-        import time
-        time.sleep(0.1)
+        await asyncio.sleep(0.1)
         self.history_dropdown.visible = False
         self.page.update()
 
@@ -459,12 +522,14 @@ class WeatherApp:
                 )
             )
 
+    @watch
     def select_history(self, city):
         self.city_input.value = city
         self.history_dropdown.visible = False
         self.page.update()
         self.on_search(None)
 
+    @watch
     def remove_from_history(self, e):
         city = e.control.data
         if city in self.search_history:
@@ -475,58 +540,48 @@ class WeatherApp:
 
     def load_history(self):
         """Load search history from file."""
-        if self.history_file.exists():
-            with open(self.history_file, 'r') as f:
-                return json.load(f)[:5]
-        return []
+        return self.history_store.load()[:Config.HISTORY_LIMIT]
     
     def save_history(self):
-        """Save search history to file."""
-        with open(self.history_file, 'w') as f:
-            json.dump(self.search_history, f)
+        """Save search history to file (written in the background)."""
+        self.history_store.save(self.search_history)
     
     def add_to_history(self, city: str):
         """Add city to history."""
         if city not in self.search_history:
             self.search_history.insert(0, city)
-            self.search_history = self.search_history[:10]  # Keep only 10
+            self.search_history = self.search_history[:Config.HISTORY_LIMIT]
             self.save_history()
 
         # Refresh the dropdown UI
         self.update_history_list()
 
-    def callback(self, recognizer, audio):
-        if not self.listening:
-            return
-
-        try:
-            text = recognizer.recognize_google(audio)
-            self.live_text.value = text.title()
-            self.page.update()
-
-            # Stop listening immediately after first recognition
-            self.listening = False
-            if self.mic_stream:
-                self.mic_stream(wait_for_stop=False)
-                self.mic_stream = None
-
-            # Play end sound
-            winsound.PlaySound(Config.END_SOUND, winsound.SND_FILENAME | winsound.SND_ASYNC)
+    async def on_voice_text(self, text: str):
+        """Show the recognized city, then search for it."""
+        self.live_text.value = text.title()
+        self.live_text.update()
+        await play_sound(Config.END_SOUND)
 
-            self.city_input.value = self.live_text.value
-            time.sleep(2) # Delay for 2 seconds
-            self.listening_dialog.open = False
+        # Leave the recognized text on screen for a moment
+        await asyncio.sleep(Config.VOICE_CONFIRM_DELAY)
+        self.city_input.value = self.live_text.value
+        self.listening_dialog.open = False
+        self.page.update()
+        self.page.run_task(self.get_weather)
 
-            self.page.update()
-            self.get_weather()
+    async def on_voice_error(self, error: Exception):
+        self.live_text.value = f"Error: {error}"
+        self.live_text.update()
 
-        except sr.UnknownValueError:
-            pass  # ignore noise
-        except Exception as e:
-            self.live_text.value = f"Error: {e}"
-            self.page.update()
-
-    def mic_click(self, e):
+    @watch
+    async def mic_click(self, e):
+        if self.voice is None:
+            try:
+                recognizer = create_recognizer()
+            except (ImportError, ValueError) as error:
+                self.show_error(f"Voice search is unavailable: {error}", hide_results=False)
+                return
+            self.voice = VoicePipeline(recognizer, self.on_voice_text, self.on_voice_error)
 
         self.live_text = ft.Text("Say something...", size=16)
 
@@ -545,30 +600,17 @@ class WeatherApp:
             actions=[self.done_button],
             actions_alignment=ft.MainAxisAlignment.CENTER,
         )
-        self.listening = True
-        self.live_text.value = "Say something..."
         self.page.open(self.listening_dialog)
         self.page.update()
 
-        # Play start sound
-        winsound.PlaySound(Config.START_SOUND, winsound.SND_FILENAME | winsound.SND_ASYNC)
-
-        # Start background listening
-        def start_listening():
-            mic = sr.Microphone()
-            # self.recognizer.adjust_for_ambient_noise(mic)
-            self.mic_stream = self.recognizer.listen_in_background(mic, self.callback)
-
-
-        threading.Thread(target=start_listening, daemon=True).start()
+        # Play start sound, then listen in the background
+        await play_sound(Config.START_SOUND)
+        self.voice.start()
 
+    @watch
     def stop_listening(self, e):
-        self.listening = False
-        temp_text = self.city_input.value
-
-        if self.mic_stream:
-            self.mic_stream(wait_for_stop=False)
-            self.mic_stream = None
+        if self.voice:
+            self.voice.stop()
 
         if self.live_text.value == "Say something...":
             pass
@@ -579,6 +621,7 @@ class WeatherApp:
         self.listening_dialog.open = False
         self.page.update()
 
+    @watch
     def toggle_theme(self, e):
         """Toggle between light and dark theme correctly, with instant icon update."""
 
@@ -599,6 +642,18 @@ class WeatherApp:
         self.update_theme_colors()
         self.page.update()
     
+    @watch
+    def toggle_units(self, e):
+        """Show every temperature and wind speed in the next unit system."""
+        units = next_units(self.city_cards.units)
+        self.units_button.text = TEMPERATURE_SYMBOLS[units]
+        self.weather_container.set_units(units)
+        self.forecast_container.set_units(units)
+        self.city_cards.set_units(units)
+        # One update sends the panels and every saved city card
+        self.city_cards.flush()
+
+    @watch
     def on_search(self, e):
         """Handle search button click or enter key press."""
         self.page.run_task(self.get_weather)
@@ -611,309 +666,77 @@ class WeatherApp:
         if not city:
             self.show_error("Please enter a city name")
             return
+
+        # A city picked from the suggestions (or typed exactly like one) is
+        # looked up by ID, which is unambiguous
+        selected = self.selected_city
+        if selected is None or selected.label != city:
+            selected = self.city_index.find(city)
+        if self.prefetcher:
+            self.prefetcher.record_search(city)
         
         # Show loading, hide previous results
         self.add_to_history(city)
         self.loading.visible = True
         self.error_message.visible = False
         self.weather_container.visible = False
-        self.forecast_container.visible = False
+        self.forecast_container.forecast_section.visible = False
         self.page.update()
         
+        # Fetch weather data and forecast at the same time
+        if selected:
+            weather_task = asyncio.create_task(
+                self.weather_service.get_weather_by_id(selected.city_id)
+            )
+            forecast_task = asyncio.create_task(
+                self.weather_service.get_forecast_by_id(selected.city_id)
+            )
+        else:
+            weather_task = asyncio.create_task(self.weather_service.get_weather(city))
+            forecast_task = asyncio.create_task(self.weather_service.get_forecast(city))
+
+        # Each section renders as soon as its own data lands, so a slow or
+        # retrying current-weather call never holds back the forecast
+        shown = {}  # data already on screen: "weather", "days"
+
+        async def show_current():
+            weather = shown["weather"] = await weather_task
+            await self.display_weather(weather)
+            if "days" in shown:
+                # The forecast got here first; today's card can now use
+                # the current conditions
+                self.forecast_container.set_days(shown["days"], weather)
+                self.forecast_container.update()
+
+        async def show_forecast():
+            days = shown["days"] = aggregate_daily(await forecast_task)[:5]
+            await self.display_forecast(days, shown.get("weather"))
+
         try:
-            # Fetch weather data and forecast
-            weather_data = await self.weather_service.get_weather(city)
-            forecast_data = await self.weather_service.get_forecast(city)
-            
-            # Display weather and forecast
-            await self.display_weather(weather_data)
-            await self.display_forecast(forecast_data)
-            
-        except Exception as e:
-            self.show_error(str(e))
+            results = await asyncio.gather(
+                show_current(), show_forecast(), return_exceptions=True
+            )
+            errors = [result for result in results if isinstance(result, Exception)]
+
+            # A failure in one part keeps the other part on screen
+            if errors:
+                self.show_error(str(errors[0]), hide_results=len(errors) == 2)
         
         finally:
             self.loading.visible = False
             self.page.update()
     
-    async def display_weather(self, data: dict):
+    async def display_weather(self, weather: CurrentWeather):
         """Display weather information."""
-        # Extract data
-        city_name = data.get("name", "Unknown")
-        country = data.get("sys", {}).get("country", "")
-        feels_like = data.get("main", {}).get("feels_like", 0)
-        description = data.get("weather", [{}])[0].get("description", "").title()
-
-        self.temp = data.get("main", {}).get("temp", 0)
-        self.icon_code = data.get("weather", [{}])[0].get("icon", "01d")
-
-        self.humidity = data.get("main", {}).get("humidity", 0)
-        self.wind_speed = data.get("wind", {}).get("speed", 0)
-        self.pressure = data.get("main",{}).get("pressure", 0)
-        self.cloudiness = data.get("clouds",{}).get("all", 0)
-
-        self.min_temp = data.get("main", {}).get("temp_min", 0)
-        self.max_temp = data.get("main", {}).get("temp_max", 0)
-
-        self.temperature_text = ft.Text(
-            f"{self.temp:.1f}°C",
-            size=48,
-            weight=ft.FontWeight.BOLD,
-            color=ft.Colors.BLUE_900 if self.page.platform_brightness == ft.Brightness.LIGHT else ft.Colors.BLUE_50,
-        )
-
-        # Build weather display
-        self.weather_container.content = ft.Column(
-            [
-                # Location
-                ft.Text(
-                    f"{city_name}, {country}",
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                ),
-                
-                # Weather icon and description
-            
-                ft.Image(
-                    src=f"https://openweathermap.org/img/wn/{self.icon_code}@2x.png",
-                    width=100,
-                    height=100,
-                ),
-                ft.Text(
-                    description,
-                    size=20,
-                    italic=True,
-                ),
-                
-                self.temperature_text,
-                
-                ft.Text(
-                    f"Feels like {feels_like:.1f}°C",
-                    size=16,
-                ),
-
-                ft.Row(
-                    [
-                        ft.Row(
-                            [
-                                ft.Icon(ft.Icons.ARROW_DOWNWARD, size=14),
-                                ft.Text(f"{self.min_temp:.1f}°C", size=14)
-                            ],
-                            spacing=3
-                        ),
-                        ft.Row(
-                            [
-                                ft.Icon(ft.Icons.ARROW_UPWARD, size=14),
-                                ft.Text(f"{self.max_temp:.1f}°C", size=14)
-                            ],
-                            spacing=3
-                        )
-                    ],
-                    spacing=10
-                ),
-                
-                ft.Divider(),
-                
-                # Additional info
-                ft.Row(
-                    [
-                        self.create_info_card(
-                            ft.Icons.WATER_DROP,
-                            "Humidity",
-                            f"{self.humidity}%"
-                        ),
-                        self.create_info_card(
-                            ft.Icons.AIR,
-                            "Wind Speed",
-                            f"{self.wind_speed} m/s"
-                        )
-                    ],
-                    expand=2,
-                    alignment=ft.MainAxisAlignment.CENTER,
-                ),
-                ft.Row(
-                    [
-                        self.create_info_card(
-                            ft.Icons.COMPRESS,
-                            "Pressure",
-                            f"{self.pressure} hPa"
-                        ),
-                        self.create_info_card(
-                            ft.Icons.CLOUD,
-                            "Cloudiness",
-                            f"{self.cloudiness}%"
-                        )
-                    ],
-                    expand=True,
-                    alignment=ft.MainAxisAlignment.CENTER
-                )
-            ],
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            spacing=7
-        )
-
-        # Animation
-        self.weather_container.animate_opacity = 300
-        self.weather_container.opacity = 0
-        self.weather_container.visible = True
-        self.page.update()
-
-        # Fade in
-        await asyncio.sleep(0.1)
-        self.weather_container.opacity = 1
-        self.page.update()
-
-    async def display_forecast(self, data):
-        """Display five-day weather forecast"""
-        # Extract data
-        forecast_days = data.get("list", {})
-       
-        current_date = datetime.date.today()
-
-        self.days_container = ft.Row(
-            controls=[
-                self.create_forecast_card(
-                    current_date.strftime('%A').upper(),
-                    self.icon_code,
-                    self.temp,
-                    self.min_temp,
-                    self.max_temp)
-                ],
-            expand=True,
-            spacing=10
-        )
-
-        for i in range(1, 5):
-            next_day = current_date + datetime.timedelta(days=i)
-
-            icon_code = forecast_days[i].get("weather", [{}])[0].get("icon", "01d")
-            temperature = forecast_days[i].get("main", {}).get("temp", 0)
-            min_temp = forecast_days[i].get("main", {}).get("temp_min", 0)
-            max_temp = forecast_days[i].get("main", {}).get("temp_max", 0)
-
-            self.days_container.controls.append(
-                self.create_forecast_card(
-                    next_day.strftime('%A').upper(),
-                    icon_code,
-                    temperature,
-                    min_temp,
-                    max_temp
-                )
-            )
-
-        # Build forecast display
-        self.forecast_container.content = ft.Column(
-            [
-                ft.Row(
-                    [
-                        ft.Text("Multi-City Overview", size=24, weight=ft.FontWeight.BOLD),
-                        ft.IconButton(
-                            icon=ft.Icons.ADD,
-                            tooltip="Add City",
-                            on_click=self.open_add_city_dialog
-                        )
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                ),  
-                self.cities_container,
-                ft.Text(
-                    "5-Day Forecast",
-                    size=24,
-                    weight=ft.FontWeight.BOLD,
-                ),
-                ft.Divider(),
-                self.days_container
-            ]
-        )
-
-        # Animation
-        self.forecast_container.animate_opacity = 300
-        self.forecast_container.opacity = 0
-        self.forecast_container.visible = True
-        self.page.update()
-
-        # Fade in
-        await asyncio.sleep(0.1)
-        self.forecast_container.opacity = 1
-        self.page.update()
-
-    def create_forecast_card(self, day, icon_code, temp, min_temp, max_temp):
-        def create_info_row(icon, value):
-            return ft.Row(
-                [
-                    ft.Icon(icon, size=14, color=ft.Colors.BLUE_500),
-                    ft.Text(
-                        value,
-                        size=12,
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.BLUE_900,
-                    )
-                ],
-                expand=True,
-                alignment=ft.MainAxisAlignment.CENTER
-            )
-        
-        return ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(day, color=ft.Colors.BLACK, weight=ft.FontWeight.W_500),
-                    ft.Image(
-                        src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
-                        width=80,
-                        height=80,
-                    ),
-                    ft.Text(
-                        f"{temp:.1f}°C",
-                        size=24,
-                        weight=ft.FontWeight.W_500,
-                        color=ft.Colors.BLUE_900,
-                    ),
-                    ft.Column(
-                        [
-                            create_info_row(
-                                ft.Icons.ARROW_DOWNWARD, f"{min_temp:.1f}°C"
-                            ),
-                            create_info_row(
-                                ft.Icons.ARROW_UPWARD, f"{max_temp:.1f}°C"
-                            )
-                        ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.CENTER
-                    )
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=20,
-                expand=True
-            ),
-            expand=True,
-            bgcolor=ft.Colors.WHITE,
-            border_radius=10,
-            padding=15,
-            width=130,
-        )
-
-    def create_info_card(self, icon, label, value):
-        """Create an info card for weather details."""
-        return ft.Container(
-            content=ft.Column(
-                [
-                    ft.Icon(icon, size=30, color=ft.Colors.BLUE_700),
-                    ft.Text(label, size=12, color=ft.Colors.GREY_600),
-                    ft.Text(
-                        value,
-                        size=16,
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.BLUE_900,
-                    ),
-                ],
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=5,
-            ),
-            bgcolor=ft.Colors.WHITE,
-            border_radius=10,
-            padding=15,
-            width=150,
-        )
+        self.weather_container.set_weather(weather)
+        await fade_in(self.weather_container)
+
+    async def display_forecast(
+        self, days: List[DailySummary], current: Optional[CurrentWeather] = None
+    ):
+        """Display five-day weather forecast (3-hour slots grouped into days)."""
+        self.forecast_container.set_days(days, current)
+        await fade_in(self.forecast_container.forecast_section)
     
     def update_theme_colors(self):
         # Determine actual brightness
@@ -939,17 +762,25 @@ class WeatherApp:
             ft.Colors.BLUE_900 if is_light else ft.Colors.BLUE_50
         )
 
-    def show_error(self, message: str):
+    def show_error(self, message: str, hide_results: bool = True):
         """Display error message."""
         self.error_message.value = f"❌ {message}"
         self.error_message.visible = True
-        self.weather_container.visible = False
-        self.forecast_container.visible = False
+        if hide_results:
+            self.weather_container.visible = False
+            self.forecast_container.forecast_section.visible = False
         self.page.update()
 
 def main(page: ft.Page):
     """Main entry point."""
+    startup_timeline.mark("flet session started")
+    install_watchdog(page)  # no-op unless LOOP_WATCHDOG is set
+    try:
+        Config.validate()
+    except ValueError as e:
+        page.add(ft.Text(str(e), color=ft.Colors.RED_700))
+        return
     WeatherApp(page)
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main, assets_dir=Config.ASSETS_DIR)
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""Request metrics for the weather service."""
+
+import json
+from collections import Counter, defaultdict
+from typing import Dict, Optional, Sequence
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointStats:
+    """Counters and latency histogram for one API endpoint."""
+
+    __slots__ = (
+        "requests", "statuses", "errors", "bucket_counts",
+        "latency_sum", "bytes_received", "lookups", "lookup_errors",
+    )
+
+    def __init__(self, n_buckets: int):
+        # Upstream HTTP attempts (retries included)
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.bucket_counts = [0] * (n_buckets + 1)  # last one is +Inf
+        self.latency_sum = 0.0
+        self.bytes_received = 0
+        # Service calls, however many attempts (or none) they took
+        self.lookups = 0
+        self.lookup_errors: Counter = Counter()
+
+
+class ServiceMetrics:
+    """
+    Per-endpoint request counters, latency histograms and cache counters.
+
+    WeatherService only records into this when metrics are enabled
+    (Config.METRICS_ENABLED); otherwise its ``metrics`` attribute is None
+    and each request pays a single attribute check.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.cache: Dict[str, Counter] = defaultdict(Counter)
+        self.coalesced = 0
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats(len(self.buckets))
+        return stats
+
+    def record_request(
+        self,
+        endpoint: str,
+        latency: float,
+        status: Optional[int] = None,
+        error: Optional[str] = None,
+        nbytes: int = 0,
+    ):
+        """
+        Record one upstream HTTP attempt; every retry is recorded separately.
+
+        Args:
+            endpoint: Endpoint name, e.g. "weather" or "forecast"
+            latency: Time the attempt took, in seconds
+            status: HTTP status code, if a response was received
+            error: Error class, if the attempt failed (see WeatherService._send)
+            nbytes: Response body size in bytes
+        """
+        stats = self._stats(endpoint)
+        stats.requests += 1
+        stats.latency_sum += latency
+        stats.bytes_received += nbytes
+        if status is not None:
+            stats.statuses[status] += 1
+        if error is not None:
+            stats.errors[error] += 1
+
+        for i, bound in enumerate(self.buckets):
+            if latency <= bound:
+                stats.bucket_counts[i] += 1
+                break
+        else:
+            stats.bucket_counts[-1] += 1
+
+    def record_lookup(self, endpoint: str, error: Optional[str] = None):
+        """
+        Record the outcome of one service call that needed the API.
+
+        Coalesced calls are counted here too, and so are calls rejected
+        before any request was sent (e.g. "circuit_open").
+        """
+        stats = self._stats(endpoint)
+        stats.lookups += 1
+        if error is not None:
+            stats.lookup_errors[error] += 1
+
+    def record_cache(self, endpoint: str, result: str):
+        """Record a cache lookup result ("hit", "stale", "disk", "miss", "offline")."""
+        self.cache[endpoint][result] += 1
+
+    def record_coalesced(self):
+        """Record a call that joined an identical request already in flight."""
+        self.coalesced += 1
+
+    def snapshot(self) -> Dict:
+        """Return all metrics as plain, JSON-serializable data."""
+        endpoints = {}
+        for name, stats in self.endpoints.items():
+            cumulative, histogram = 0, {}
+            for bound, count in zip(self.buckets + (float("inf"),), stats.bucket_counts):
+                cumulative += count
+                histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            endpoints[name] = {
+                "requests": stats.requests,
+                "statuses": {str(code): n for code, n in stats.statuses.items()},
+                "errors": dict(stats.errors),
+                "latency_sum": stats.latency_sum,
+                "latency_buckets": histogram,
+                "bytes_received": stats.bytes_received,
+                "lookups": stats.lookups,
+                "lookup_errors": dict(stats.lookup_errors),
+            }
+        return {
+            "endpoints": endpoints,
+            "cache": {name: dict(results) for name, results in self.cache.items()},
+            "coalesced": self.coalesced,
+        }
+
+    def to_json(self) -> str:
+        """Export a JSON snapshot."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export a snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        endpoints = snapshot["endpoints"]
+        metric(
+            "weather_requests_total", "counter",
+            "HTTP requests sent to the weather API, retries included.",
+            [({"endpoint": name}, e["requests"]) for name, e in endpoints.items()],
+        )
+        metric(
+            "weather_responses_total", "counter", "Responses by HTTP status code.",
+            [({"endpoint": name, "status": code}, n)
+             for name, e in endpoints.items() for code, n in e["statuses"].items()],
+        )
+        metric(
+            "weather_errors_total", "counter", "Failed requests by error class.",
+            [({"endpoint": name, "error": error}, n)
+             for name, e in endpoints.items() for error, n in e["errors"].items()],
+        )
+        lines.append("# HELP weather_request_duration_seconds Request latency histogram.")
+        lines.append("# TYPE weather_request_duration_seconds histogram")
+        for name, e in endpoints.items():
+            for bound, count in e["latency_buckets"].items():
+                lines.append(
+                    f'weather_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {count}'
+                )
+            lines.append(f'weather_request_duration_seconds_sum{{endpoint="{name}"}} {e["latency_sum"]}')
+            lines.append(f'weather_request_duration_seconds_count{{endpoint="{name}"}} {e["requests"]}')
+        metric(
+            "weather_response_bytes_total", "counter", "Response bytes received.",
+            [({"endpoint": name}, e["bytes_received"]) for name, e in endpoints.items()],
+        )
+        metric(
+            "weather_lookups_total", "counter", "Service calls that needed the API.",
+            [({"endpoint": name}, e["lookups"]) for name, e in endpoints.items()],
+        )
+        metric(
+            "weather_lookup_errors_total", "counter", "Failed service calls by error class.",
+            [({"endpoint": name, "error": error}, n)
+             for name, e in endpoints.items() for error, n in e["lookup_errors"].items()],
+        )
+        metric(
+            "weather_cache_lookups_total", "counter", "Cache lookups by result.",
+            [({"endpoint": name, "result": result}, n)
+             for name, results in snapshot["cache"].items() for result, n in results.items()],
+        )
+        metric(
+            "weather_coalesced_requests_total", "counter",
+            "Calls that shared an identical in-flight request.",
+            [({}, snapshot["coalesced"])],
+        )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,122 @@
+"""Compact weather records parsed from OpenWeatherMap responses."""
+
+import datetime
+import json
+from typing import Dict, NamedTuple, Optional, Tuple
+
+try:
+    # Optional faster JSON decoder (pip install orjson)
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+class CurrentWeather(NamedTuple):
+    """Current conditions for one city (/weather response)."""
+    city_id: int
+    name: str
+    country: str
+    lat: float
+    lon: float
+    dt: int  # time of the observation (UTC timestamp)
+    timezone: int  # shift from UTC in seconds
+    description: str
+    icon: str
+    temp: float
+    feels_like: float
+    temp_min: float
+    temp_max: float
+    humidity: int
+    pressure: int
+    wind_speed: float
+    clouds: int
+    cached_at: Optional[float] = None  # set when served from the disk cache
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "CurrentWeather":
+        """Build a record from a decoded /weather response."""
+        main = data.get("main", {})
+        weather = (data.get("weather") or [{}])[0]
+        coord = data.get("coord", {})
+        return cls(
+            city_id=data.get("id", 0),
+            name=data.get("name", "Unknown"),
+            country=data.get("sys", {}).get("country", ""),
+            lat=coord.get("lat", 0.0),
+            lon=coord.get("lon", 0.0),
+            dt=data.get("dt", 0),
+            timezone=data.get("timezone", 0),
+            description=weather.get("description", "").title(),
+            icon=weather.get("icon", "01d"),
+            temp=main.get("temp", 0),
+            feels_like=main.get("feels_like", 0),
+            temp_min=main.get("temp_min", 0),
+            temp_max=main.get("temp_max", 0),
+            humidity=main.get("humidity", 0),
+            pressure=main.get("pressure", 0),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+            clouds=data.get("clouds", {}).get("all", 0),
+        )
+
+
+class ForecastSlot(NamedTuple):
+    """One 3-hour slot of the 5-day forecast."""
+    dt: int
+    temp: float
+    temp_min: float
+    temp_max: float
+    icon: str
+    precipitation: float  # rain + snow in mm over the 3 hours
+    wind_speed: float
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "ForecastSlot":
+        """Build a record from one entry of a /forecast "list"."""
+        main = data.get("main", {})
+        temp = main.get("temp", 0)
+        return cls(
+            dt=data.get("dt", 0),
+            temp=temp,
+            temp_min=main.get("temp_min", temp),
+            temp_max=main.get("temp_max", temp),
+            icon=(data.get("weather") or [{}])[0].get("icon", "01d"),
+            precipitation=(
+                data.get("rain", {}).get("3h", 0) + data.get("snow", {}).get("3h", 0)
+            ),
+            wind_speed=data.get("wind", {}).get("speed", 0),
+        )
+
+
+class Forecast(NamedTuple):
+    """5-day / 3-hour forecast for one city (/forecast response)."""
+    city_id: int
+    name: str
+    country: str
+    timezone: int  # shift from UTC in seconds
+    slots: Tuple[ForecastSlot, ...]
+    cached_at: Optional[float] = None  # set when served from the disk cache
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Forecast":
+        """Build a record from a decoded /forecast response."""
+        city = data.get("city", {})
+        return cls(
+            city_id=city.get("id", 0),
+            name=city.get("name", "Unknown"),
+            country=city.get("country", ""),
+            timezone=city.get("timezone", 0),
+            slots=tuple(ForecastSlot.from_json(slot) for slot in data.get("list", [])),
+        )
+
+
+class DailySummary(NamedTuple):
+    """Weather aggregated over one local calendar day."""
+    date: datetime.date
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    icon: str  # most frequent icon of the day, e.g. "10d"
+    precipitation: float  # rain + snow in mm
+    wind_mean: float
+    wind_max: float
@@ -0,0 +1,105 @@
+"""Crash-safe JSON files for the search history and saved cities."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class JsonStore:
+    """
+    A JSON file written behind the caller's back.
+
+    save() only takes a snapshot; the file is written on a background
+    thread once ``debounce`` seconds have passed, so a burst of changes
+    costs one write and the UI never waits on the disk. Writes go to a
+    temporary file that is then renamed over the old one, so a crash leaves
+    either the old or the new content, never half of it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        default_factory: Callable[[], Any] = list,
+        debounce: float = 0.5,
+    ):
+        """
+        Args:
+            path: JSON file
+            default_factory: Builds the value used when the file is
+                missing or unreadable
+            debounce: Seconds to wait for more changes before writing
+        """
+        self.path = Path(path)
+        self.default_factory = default_factory
+        self.debounce = debounce
+        self._lock = threading.Lock()  # guards _pending and _timer
+        self._write_lock = threading.Lock()  # one write to the file at a time
+        self._pending: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def load(self) -> Any:
+        """
+        Read the file.
+
+        A corrupt file, or one holding the wrong type of value, is renamed
+        to "<name>.corrupt" for inspection and the default is returned.
+        """
+        default = self.default_factory()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return default
+        except (OSError, ValueError) as e:
+            self._set_aside(e)
+            return default
+
+        if not isinstance(data, type(default)):
+            self._set_aside(TypeError(f"expected {type(default).__name__}"))
+            return default
+        return data
+
+    def _set_aside(self, error: Exception):
+        corrupt = self.path.with_name(self.path.name + ".corrupt")
+        print(f"Could not read {self.path} ({error}); moved it to {corrupt.name}")
+        try:
+            os.replace(self.path, corrupt)
+        except OSError:
+            pass
+
+    def save(self, data: Any):
+        """Schedule a write of ``data`` (serialized now, written later)."""
+        text = json.dumps(data)
+        with self._lock:
+            self._pending = text
+            if self._timer is None:
+                self._timer = threading.Timer(self.debounce, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write the pending snapshot now, if there is one."""
+        # The snapshot is taken once the file is ours, so the newest one is
+        # always written last; save() only waits for the snapshot, not the disk
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                text, self._pending = self._pending, None
+            if text is not None:
+                self._write(text)
+
+    def _write(self, text: str):
+        """Replace the file atomically."""
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not save {self.path}: {e}")
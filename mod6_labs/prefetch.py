@@ -0,0 +1,134 @@
+"""Predictive prefetch of the searches the user is likely to make next."""
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import Config
+from resilience import TokenBucket
+from weather_service import WeatherService, WeatherServiceError
+
+
+class Prefetcher:
+    """
+    Warms the cache for cities the user will probably search for next.
+
+    When the app goes idle (e.g. the history dropdown opens), the current
+    weather and forecast of the top history entries and saved cities are
+    fetched one city at a time, so a click on one of them is answered from
+    memory. Prefetching stays within its own per-minute request budget,
+    skips anything already fresh in the cache, and stops as soon as the
+    user types something else. Searches are counted as hits when they ask
+    for a prefetched city.
+    """
+
+    def __init__(
+        self,
+        service: WeatherService,
+        resolve: Optional[Callable[[str], Optional[int]]] = None,
+    ):
+        """
+        Args:
+            service: Service whose cache is warmed
+            resolve: Returns the city ID a search will be made by, or None
+                when it will be made by name; prefetches must use the same
+                lookup to land in the same cache entry
+        """
+        self.service = service
+        self.resolve = resolve
+        # Bursts large enough to warm the top history entries at once
+        self.budget = TokenBucket(
+            Config.PREFETCH_BUDGET_PER_MINUTE, burst=2 * Config.PREFETCH_HISTORY_ENTRIES
+        )
+        self.warmed: Dict[str, float] = {}  # normalized city -> time.monotonic() warmed
+        self.prefetched = 0  # cities warmed
+        self.requests = 0  # requests sent for them
+        self.searches = 0
+        self.hits = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(city: str) -> str:
+        return city.strip().casefold()
+
+    def schedule(self, cities: Iterable[str]):
+        """
+        Prefetch cities, most likely first, once the app has been idle for
+        Config.PREFETCH_IDLE_DELAY (call from the event loop).
+
+        Replaces any prefetch still waiting or running.
+        """
+        self.cancel()
+        candidates = list(dict.fromkeys(city for city in cities if city.strip()))
+        if candidates:
+            self._task = asyncio.create_task(self._run(candidates))
+
+    def cancel(self):
+        """Stop prefetching, e.g. because the user started typing."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, cities: List[str]):
+        await asyncio.sleep(Config.PREFETCH_IDLE_DELAY)
+        for city in cities:
+            city_id = self.resolve(city) if self.resolve else None
+            cache_name = f"id:{city_id}" if city_id else city
+            missing = [
+                endpoint for endpoint in ("weather", "forecast")
+                if not self.service.is_fresh(endpoint, cache_name)
+            ]
+            if not missing:
+                continue
+            allowed = [endpoint for endpoint in missing if self.budget.try_acquire()]
+            if allowed:
+                await self._fetch(city, city_id, allowed)
+            if len(allowed) < len(missing):
+                return  # out of budget; try again on the next idle moment
+
+    async def _fetch(self, city: str, city_id: Optional[int], endpoints: List[str]):
+        """Fetch some of a city's lookups; failures just leave it cold."""
+        if city_id:
+            lookups = {
+                "weather": lambda: self.service.get_weather_by_id(city_id),
+                "forecast": lambda: self.service.get_forecast_by_id(city_id),
+            }
+        else:
+            lookups = {
+                "weather": lambda: self.service.get_weather(city),
+                "forecast": lambda: self.service.get_forecast(city),
+            }
+        self.requests += len(endpoints)
+        results = await asyncio.gather(
+            *(lookups[endpoint]() for endpoint in endpoints), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            if not isinstance(error, WeatherServiceError):
+                raise error
+        if not errors:
+            self.warmed[self._key(city)] = time.monotonic()
+            self.prefetched += 1
+
+    def record_search(self, city: str):
+        """Count a search, as a hit if it asks for a city warmed recently."""
+        self.searches += 1
+        warmed_at = self.warmed.pop(self._key(city), None)
+        hit = warmed_at is not None and time.monotonic() - warmed_at < Config.CACHE_TTL_WEATHER
+        if hit:
+            self.hits += 1
+        if self.service.metrics:
+            self.service.metrics.record_cache("prefetch", "hit" if hit else "miss")
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of searches answered by a prefetch."""
+        return self.hits / self.searches if self.searches else 0.0
+
+    def report(self) -> str:
+        used = f"{self.hits}/{self.prefetched}" if self.prefetched else "0"
+        return (
+            f"Prefetch: {self.hits} of {self.searches} searches hit "
+            f"({self.hit_rate:.0%}), {used} prefetched cities used, "
+            f"{self.requests} requests sent"
+        )
@@ -0,0 +1,225 @@
+"""Background refresh of the saved city cards."""
+
+import asyncio
+import random
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config import Config
+from models import CurrentWeather
+from resilience import TokenBucket
+from weather_service import WeatherService
+
+
+class _Entry:
+    """Refresh state of one saved city."""
+
+    __slots__ = ("due", "observed_at", "misses")
+
+    def __init__(self):
+        self.due = 0.0  # time.monotonic() of the next refresh
+        self.observed_at: Optional[int] = None  # "dt" of the last observation
+        self.misses = 0  # failed or unchanged refreshes in a row
+
+
+class RefreshScheduler:
+    """
+    Keeps saved city cards up to date while the app stays open.
+
+    Each city is refreshed shortly after the provider is expected to have
+    a new observation: its last observation time (``dt``) plus the update
+    cadence. Refreshes that fail or bring nothing new back off
+    exponentially, and every delay is jittered so cards do not all refresh
+    in the same second. Due cities are refreshed in batches through
+    WeatherService.get_weather_many, bypassing the cache, visible cards
+    first, within a per-minute budget shared by all cards. Nothing runs
+    while paused (e.g. the window is hidden).
+
+    The public methods may be called from Flet's handler threads; they
+    hand their work over to the event loop the scheduler runs on.
+    """
+
+    def __init__(
+        self,
+        service: WeatherService,
+        on_update: Callable[[str, CurrentWeather], None],
+        on_flush: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Args:
+            service: Service used for the refreshes
+            on_update: Called with (city, weather) for every refreshed city
+            on_flush: Called once after each batch, e.g. to send all the
+                card changes to the client in one update
+        """
+        self.service = service
+        self.on_update = on_update
+        self.on_flush = on_flush
+        self.budget = TokenBucket(Config.REFRESH_BUDGET_PER_MINUTE)
+        self.entries: Dict[str, _Entry] = {}
+        self.visible: Set[str] = set()
+        self._wake = asyncio.Event()
+        self._running = asyncio.Event()
+        self._running.set()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        """Start the refresh loop (call from the event loop)."""
+        self._loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _on_loop(self, callback: Callable, *args):
+        """Run ``callback`` on the scheduler's loop, from whichever thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self._loop is None or running is self._loop:
+            callback(*args)
+        else:
+            # asyncio.Event and the entries are not thread-safe
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    async def stop(self):
+        """Stop the refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def add(self, city: str, weather: Optional[CurrentWeather] = None):
+        """
+        Schedule a city, or reschedule it after it was fetched elsewhere.
+
+        Args:
+            city: Saved city key
+            weather: Latest data shown for the city, if any
+        """
+        self._on_loop(self._add, city, weather)
+
+    def _add(self, city: str, weather: Optional[CurrentWeather]):
+        entry = self.entries.get(city)
+        if entry is None:
+            entry = self.entries[city] = _Entry()
+        self._reschedule(entry, weather)
+        self._wake.set()
+
+    def remove(self, city: str):
+        """Stop refreshing a city."""
+        self._on_loop(self._remove, city)
+
+    def _remove(self, city: str):
+        self.entries.pop(city, None)
+        self.visible.discard(city)
+
+    def set_visible(self, cities: Iterable[str]):
+        """Tell which cards are on screen; they are refreshed first."""
+        self.visible = set(cities)
+
+    def pause(self):
+        """Stop sending refreshes until resume() is called."""
+        self._on_loop(self._running.clear)
+
+    def resume(self):
+        """Resume refreshing; overdue cities are refreshed right away."""
+        self._on_loop(self._resume)
+
+    def _resume(self):
+        self._running.set()
+        self._wake.set()
+
+    def _reschedule(self, entry: _Entry, weather: Optional[CurrentWeather]):
+        """Work out when a city should be refreshed next."""
+        if weather is None or weather.cached_at is not None:
+            # Failed, or only an offline copy could be shown
+            entry.misses += 1
+        elif weather.dt == entry.observed_at:
+            # The provider has not published a new observation yet
+            entry.misses += 1
+        else:
+            entry.observed_at = weather.dt
+            entry.misses = 0
+
+        if entry.misses or entry.observed_at is None:
+            delay = Config.REFRESH_MIN_INTERVAL * 2 ** max(0, entry.misses - 1)
+        else:
+            # The next observation is expected one cadence after this one
+            delay = (
+                entry.observed_at + Config.REFRESH_CADENCE + Config.REFRESH_GRACE
+                - time.time()
+            )
+        delay = min(max(delay, Config.REFRESH_MIN_INTERVAL), Config.REFRESH_MAX_INTERVAL)
+        delay *= random.uniform(1 - Config.REFRESH_JITTER, 1 + Config.REFRESH_JITTER)
+        entry.due = time.monotonic() + delay
+
+    async def _sleep(self, timeout: Optional[float]):
+        """Sleep until the timeout, or until woken by add() or resume()."""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self):
+        while True:
+            await self._running.wait()
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # A bug in one round must not end refreshing for the session
+                print(f"Background refresh failed: {e!r}")
+                await self._sleep(Config.REFRESH_MIN_INTERVAL)
+
+    async def _step(self):
+        """Refresh the cities that are due, or sleep until one is."""
+        if not self.entries:
+            await self._sleep(None)
+            return
+
+        now = time.monotonic()
+        due = [city for city, entry in self.entries.items() if entry.due <= now]
+        if not due:
+            await self._sleep(min(entry.due for entry in self.entries.values()) - now)
+            return
+
+        # Visible cards first, then the most overdue
+        due.sort(key=lambda city: (city not in self.visible, self.entries[city].due))
+        batch: List[str] = []
+        for city in due:
+            if not self.budget.try_acquire():
+                break
+            batch.append(city)
+        if not batch:
+            await self._sleep(1 / self.budget.rate)
+            return
+
+        await self._refresh(batch)
+
+    async def _refresh(self, cities: List[str]):
+        """Fetch a batch of cities and hand the results to on_update."""
+        # Keep a city from being picked again while its refresh is running
+        for city in cities:
+            entry = self.entries.get(city)
+            if entry is not None:
+                entry.due = float("inf")
+
+        # Bypass the cache: a fresh entry would only hand back the
+        # observation already shown, and the budget token would buy nothing
+        async for city, weather, error in self.service.get_weather_many(cities, force=True):
+            entry = self.entries.get(city)
+            if entry is None:
+                continue  # removed meanwhile
+            self._reschedule(entry, weather)
+            if error:
+                print(f"Failed to refresh {city}: {error}")
+            else:
+                self.on_update(city, weather)
+        if self.on_flush:
+            self.on_flush()
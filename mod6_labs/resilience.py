@@ -0,0 +1,150 @@
+"""Retry, circuit breaker and rate limiting for the weather service."""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        """
+        Args:
+            attempts: Total tries per request, including the first one
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound for any single backoff, in seconds
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retrying after the given failed attempt (0-based).
+
+        A server-provided Retry-After wins over the computed backoff, but is
+        still capped at max_delay.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream host keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are refused for ``reset_timeout`` seconds. Then a single trial
+    request is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+
+    def before_request(self):
+        """
+        Check whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError("Circuit open")
+            self.state = self.HALF_OPEN
+            self._trial_running = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_running:
+                raise CircuitOpenError("Circuit half-open, trial request running")
+            self._trial_running = True
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit when the threshold is reached."""
+        self.failures += 1
+        self._trial_running = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter.
+
+    Requests wait (in arrival order) for a token instead of being sent and
+    rejected by the API with a 429. The refill rate leaves room for the
+    burst, so no 60-second window ever exceeds ``calls_per_minute``.
+    """
+
+    def __init__(self, calls_per_minute: int, burst: Optional[int] = None):
+        """
+        Args:
+            calls_per_minute: Quota of the API plan
+            burst: Requests that may be sent back to back
+                (defaults to a third of the quota)
+        """
+        self.capacity = burst or max(1, calls_per_minute // 3)
+        self.rate = max(1, calls_per_minute - self.capacity) / 60.0
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting."""
+        if time.monotonic() < self.paused_until:
+            return False
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def pause(self, seconds: float):
+        """Hold back every request for a while (e.g. after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
@@ -0,0 +1,54 @@
+"""
+Startup timeline for the weather app.
+
+With WEATHER_STARTUP_PROFILE=true, the app prints when its startup
+milestones (imports done, first page.update, saved cities loaded) were
+reached:
+
+    WEATHER_STARTUP_PROFILE=true python main.py
+
+Times are measured from the moment this module is imported, which main.py
+does before anything else. Does nothing when the variable is not set.
+
+For the cost of each import, use Python's own import profiler instead:
+
+    python -X importtime main.py 2> imports.log
+
+Every line of imports.log gives a module's own import time and its
+cumulative time (including the modules it imports), in microseconds.
+"""
+
+import os
+import sys
+import time
+from typing import List, Tuple
+
+ENABLED = os.getenv("WEATHER_STARTUP_PROFILE", "false").lower() in ("1", "true", "yes")
+
+_start = time.perf_counter()
+_marks: List[Tuple[str, float]] = []
+_finished = False
+
+
+def mark(label: str):
+    """Record a startup milestone."""
+    if ENABLED:
+        _marks.append((label, time.perf_counter() - _start))
+
+
+def report() -> str:
+    """Format the milestones recorded so far."""
+    lines = ["Startup timeline (ms since start):"]
+    for label, at in _marks:
+        lines.append(f"  {at * 1000:8.1f}  {label}")
+    return "\n".join(lines)
+
+
+def finish(label: str):
+    """Record the last milestone and print the report."""
+    global _finished
+    if not ENABLED or _finished:
+        return
+    _finished = True
+    mark(label)
+    print(report(), file=sys.stderr)
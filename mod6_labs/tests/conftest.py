@@ -0,0 +1,44 @@
+"""Shared fixtures: a fake clock and a WeatherService on a mock transport."""
+
+import httpx
+import pytest
+
+import resilience
+import weather_cache
+from config import Config
+from weather_service import WeatherService
+
+
+class FakeClock:
+    """Stands in for the time module (monotonic only); advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the clock of the rate limiter, breaker and response cache."""
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, "time", fake)
+    monkeypatch.setattr(weather_cache, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    """Build a WeatherService answering through ``handler``, with no delays."""
+    monkeypatch.setattr(Config, "DISK_CACHE_FILE", str(tmp_path / "cache.db"))
+    monkeypatch.setattr(Config, "RATE_LIMIT_PER_MINUTE", 6000)
+    monkeypatch.setattr(Config, "RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(Config, "METRICS_ENABLED", False)
+
+    def make(handler) -> WeatherService:
+        return WeatherService(transport=httpx.MockTransport(handler))
+    return make
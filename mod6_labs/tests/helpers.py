@@ -0,0 +1,20 @@
+"""Canned API responses for the tests."""
+
+
+def weather_json(city: str, city_id: int = 1, temp: float = 20.0, dt: int = 1_700_000_000):
+    """A minimal current weather response."""
+    return {
+        "id": city_id,
+        "name": city,
+        "dt": dt,
+        "timezone": 0,
+        "coord": {"lat": 0.0, "lon": 0.0},
+        "sys": {"country": "XX"},
+        "main": {
+            "temp": temp, "feels_like": temp, "temp_min": temp, "temp_max": temp,
+            "humidity": 50, "pressure": 1013,
+        },
+        "weather": [{"main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "wind": {"speed": 1.0},
+        "clouds": {"all": 0},
+    }
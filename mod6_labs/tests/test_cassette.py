@@ -0,0 +1,91 @@
+"""Record and replay transports."""
+
+import asyncio
+import gzip
+import os
+import shutil
+
+import httpx
+import pytest
+
+from cassette import RecordingTransport, ReplayTransport
+from config import Config
+from weather_service import WeatherService
+
+from .helpers import weather_json
+
+
+def record(path, cities, killed=None):
+    """
+    Record one weather lookup per city.
+
+    ``killed`` gets a copy of the cassette as a recorder killed after the
+    last request would leave it: flushed, without the gzip end marker.
+    """
+    def handler(request):
+        city = request.url.params["q"]
+        return httpx.Response(200, json=weather_json(city, city_id=len(city)))
+
+    async def run():
+        recorder = RecordingTransport(str(path), inner=httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=recorder) as client:
+            for city in cities:
+                await client.get(Config.BASE_URL, params={"q": city, "appid": "key"})
+            if killed:
+                shutil.copy(path, killed)
+
+    asyncio.run(run())
+
+
+def test_replay_answers_recorded_requests(tmp_path):
+    path = tmp_path / "cassette.ndjson.gz"
+    record(path, ["Paris", "Tokyo"])
+
+    replay = ReplayTransport(str(path), latency=0, fan_out=False)
+
+    async def get(city):
+        async with httpx.AsyncClient(transport=replay) as client:
+            return await client.get(Config.BASE_URL, params={"q": city, "appid": "other"})
+
+    assert asyncio.run(get("tokyo")).json()["name"] == "Tokyo"
+    assert asyncio.run(get("Lima")).status_code == 404
+
+
+def test_truncated_cassette_replays_what_was_recorded(tmp_path):
+    path = tmp_path / "killed.ndjson.gz"
+    record(tmp_path / "cassette.ndjson.gz", ["Paris", "Tokyo", "Lima"], killed=path)
+    with pytest.raises(EOFError):
+        gzip.open(path, "rt").read()
+
+    replay = ReplayTransport(str(path), latency=0)
+    assert len(replay.recordings) == 3
+
+    # Cut into the middle of the last member as well
+    cut = tmp_path / "cut.ndjson.gz"
+    shutil.copy(path, cut)
+    os.truncate(cut, os.path.getsize(cut) - 5)
+    assert 1 <= len(ReplayTransport(str(cut), latency=0).recordings) <= 3
+
+
+def test_replay_keeps_away_from_the_disk_cache(tmp_path, monkeypatch):
+    path = tmp_path / "cassette.ndjson.gz"
+    record(path, ["Paris"])
+    real_cache = tmp_path / "weather_cache.db"
+    monkeypatch.setattr(Config, "TRANSPORT", "replay")
+    monkeypatch.setattr(Config, "CASSETTE_FILE", str(path))
+    monkeypatch.setattr(Config, "DISK_CACHE_FILE", str(real_cache))
+    monkeypatch.setattr(Config, "REPLAY_LATENCY", 0)
+
+    async def run():
+        async with WeatherService() as service:
+            return await service.get_weather("Paris")
+
+    assert asyncio.run(run()).name == "Paris"
+    assert not real_cache.exists()
+
+
+def test_missing_cassette_is_a_config_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "TRANSPORT", "replay")
+    monkeypatch.setattr(Config, "CASSETTE_FILE", str(tmp_path / "missing.ndjson.gz"))
+    with pytest.raises(ValueError, match="not found"):
+        Config.validate()
@@ -0,0 +1,103 @@
+"""Prefix and region lookups of the local city index."""
+
+import gzip
+import json
+
+import pytest
+
+from city_index import CityIndex, _rows_from_city_list, write_index
+
+CITIES = [
+    ("London", "", "GB", 2643743, 51.51, -0.13),
+    ("London", "", "CA", 6058560, 42.98, -81.23),
+    ("London", "KY", "US", 4298960, 37.13, -84.08),
+    ("Londonderry", "", "GB", 2643736, 55.0, -7.31),
+    ("Logan", "UT", "US", 5777544, 41.74, -111.83),
+    ("Los Angeles", "CA", "US", 5368361, 34.05, -118.24),
+    ("Lódź", "", "PL", 3093133, 51.75, 19.47),
+    ("Springfield", "IL", "US", 4250542, 39.8, -89.64),
+    ("Springfield", "IL", "US", 4250543, 40.1, -89.1),
+]
+
+
+def write_city_list(path):
+    cities = [
+        {"id": city_id, "name": name, "state": state, "country": country,
+         "coord": {"lat": lat, "lon": lon}}
+        for name, state, country, city_id, lat, lon in CITIES
+    ]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(cities, f)
+
+
+@pytest.fixture
+def index(tmp_path):
+    city_list = tmp_path / "city.list.json.gz"
+    write_city_list(city_list)
+    path = tmp_path / "cities.tsv.gz"
+    write_index(_rows_from_city_list(city_list), path)
+    index = CityIndex(path)
+    index.load()
+    return index
+
+
+def labels(cities):
+    return [city.label for city in cities]
+
+
+def test_prefix_lookup_is_alphabetical_and_limited(index):
+    assert labels(index.suggest("lon")) == [
+        "London, CA", "London, GB", "London, KY, US", "Londonderry, GB",
+    ]
+    assert [city.name for city in index.suggest("lo")] == [
+        "Lódź", "Logan", "London", "London", "London", "Londonderry", "Los Angeles",
+    ]
+    assert len(index.suggest("lo", limit=2)) == 2
+    assert index.suggest("x") == []
+    assert index.suggest("") == []
+
+
+def test_lookup_ignores_case_and_accents(index):
+    assert labels(index.suggest("LODZ")) == ["Lódź, PL"]
+
+
+def test_region_narrows_by_country_or_state(index):
+    assert labels(index.suggest("london, ca")) == ["London, CA"]
+    assert labels(index.suggest("london, ky")) == ["London, KY, US"]
+    # "ca" is Canada for London and California for Los Angeles
+    assert labels(index.suggest("lo, ca")) == ["London, CA", "Los Angeles, CA, US"]
+    assert labels(index.suggest("lo, us, ut")) == ["Logan, UT, US"]
+    assert index.suggest("london, fr") == []
+
+
+def test_row_matching_by_state_and_country_is_listed_once(index):
+    # Logan's state (UT) and country (US) both start with "u"
+    assert labels(index.suggest("logan, u")) == ["Logan, UT, US"]
+
+
+def test_find_needs_an_unambiguous_label(index):
+    assert index.find("London, CA").city_id == 6058560
+    assert index.find("london, ky, us").city_id == 4298960
+    # Two cities with the same label: the text does not say which one
+    assert index.find("Springfield, IL, US") is None
+    assert index.find("Paris, FR") is None
+
+
+def test_city_list_loads_like_the_built_index(tmp_path, index):
+    city_list = tmp_path / "city.list.json.gz"
+    direct = CityIndex(city_list)
+    direct.load()
+
+    assert direct.keys == index.keys
+    assert direct.rows == index.rows
+    assert labels(direct.suggest("lo, ca")) == labels(index.suggest("lo, ca"))
+
+
+def test_unsorted_index_is_rejected(tmp_path):
+    path = tmp_path / "cities.tsv.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("paris\tParis\t\tFR\t1\t0\t0\n")
+        f.write("berlin\tBerlin\t\tDE\t2\t0\t0\n")
+
+    with pytest.raises(ValueError):
+        CityIndex(path).load()
@@ -0,0 +1,50 @@
+"""On-disk cache of the last responses."""
+
+import asyncio
+import time
+
+import httpx
+
+from disk_cache import DiskCache
+
+from .helpers import weather_json
+
+
+def test_cached_weather_survives_a_restart(make_service):
+    def handler(request):
+        return httpx.Response(200, json=weather_json("Paris", temp=12))
+
+    async def run():
+        async with make_service(handler) as service:
+            await service.get_weather("Paris")
+        async with make_service(handler) as restarted:
+            return await restarted.get_cached_weather("Paris")
+
+    weather = asyncio.run(run())
+    assert weather.temp == 12
+    assert weather.cached_at is not None
+
+
+def test_close_waits_for_pending_writes(make_service, monkeypatch):
+    slow_set = DiskCache.set
+
+    def set_slowly(self, key, data, fetched_at=None):
+        time.sleep(0.1)
+        slow_set(self, key, data, fetched_at)
+
+    monkeypatch.setattr(DiskCache, "set", set_slowly)
+
+    def handler(request):
+        return httpx.Response(200, json=weather_json(request.url.params["q"]))
+
+    async def run():
+        service = make_service(handler)
+        async with service:
+            await asyncio.gather(*(service.get_weather(city) for city in ("Paris", "Lima")))
+        assert not service._disk_writes
+        return service.disk_cache
+
+    disk_cache = asyncio.run(run())
+    assert disk_cache._conn is None  # closed after the writes, not reopened by them
+    keys = [key for key in disk_cache._connect().execute("SELECT key FROM responses")]
+    assert len(keys) == 2
@@ -0,0 +1,77 @@
+"""Daily aggregation of the 3-hour forecast."""
+
+import datetime
+
+import pytest
+
+from forecast import aggregate_daily, aggregate_many
+from models import Forecast, ForecastSlot
+
+# 2023-11-14 00:00 UTC
+MIDNIGHT = 1_699_920_000
+HOUR = 3600
+
+
+def slot(hours: float, temp: float, icon: str = "01d", rain: float = 0.0, wind: float = 1.0):
+    return ForecastSlot(
+        dt=MIDNIGHT + int(hours * HOUR), temp=temp, temp_min=temp - 1, temp_max=temp + 1,
+        icon=icon, precipitation=rain, wind_speed=wind,
+    )
+
+
+def forecast(*slots: ForecastSlot, timezone: int = 0) -> Forecast:
+    return Forecast(city_id=1, name="Testville", country="XX", timezone=timezone, slots=slots)
+
+
+def test_statistics_of_one_day():
+    day, = aggregate_daily(forecast(
+        slot(0, 10, rain=0.5, wind=2), slot(3, 14, rain=1.5, wind=6), slot(6, 12, wind=4),
+    ))
+
+    assert day.date == datetime.date(2023, 11, 14)
+    assert day.temp_min == 9  # lowest temp_min, not lowest temp
+    assert day.temp_max == 15
+    assert day.temp_mean == pytest.approx(12)
+    assert day.precipitation == pytest.approx(2.0)
+    assert day.wind_mean == pytest.approx(4)
+    assert day.wind_max == 6
+
+
+def test_slots_are_grouped_by_local_day():
+    # 22:00 and 23:00 UTC are already the next day three hours east of UTC
+    slots = (slot(20, 1), slot(22, 2), slot(23, 3))
+
+    utc = aggregate_daily(forecast(*slots))
+    east = aggregate_daily(forecast(*slots, timezone=3 * HOUR))
+
+    assert [day.date.day for day in utc] == [14]
+    assert [day.date.day for day in east] == [14, 15]
+    assert east[1].temp_mean == pytest.approx(2.5)
+
+
+def test_days_are_in_chronological_order():
+    days = aggregate_daily(forecast(slot(50, 3), slot(2, 1), slot(26, 2)))
+
+    assert [day.date.day for day in days] == [14, 15, 16]
+    assert [day.temp_mean for day in days] == [1, 2, 3]
+
+
+def test_dominant_icon_ignores_day_and_night():
+    day, = aggregate_daily(forecast(
+        slot(0, 5, icon="10n"), slot(3, 5, icon="01n"), slot(9, 5, icon="10d"),
+        slot(12, 5, icon="01d"), slot(15, 5, icon="10d"),
+    ))
+
+    assert day.icon == "10d"
+
+
+def test_many_forecasts_match_one_at_a_time():
+    forecasts = [
+        forecast(slot(0, 1), slot(30, 2, icon="13d")),
+        forecast(),
+        forecast(slot(1, 20, rain=3), slot(4, 24), timezone=-5 * HOUR),
+    ]
+
+    assert aggregate_many(forecasts) == [aggregate_daily(f) for f in forecasts]
+    assert aggregate_many(forecasts)[1] == []
+    assert aggregate_many([]) == []
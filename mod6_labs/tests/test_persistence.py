@@ -0,0 +1,70 @@
+"""Crash-safe JSON store."""
+
+import json
+
+from persistence import JsonStore
+
+
+def test_flush_writes_the_latest_snapshot(tmp_path):
+    store = JsonStore(tmp_path / "cities.json", debounce=60)
+    store.save(["Paris"])
+    store.save(["Paris", "Tokyo"])
+    assert not store.path.exists()  # still waiting for the debounce
+
+    store.flush()
+    assert json.loads(store.path.read_text()) == ["Paris", "Tokyo"]
+    assert store.load() == ["Paris", "Tokyo"]
+
+
+def test_save_serializes_immediately(tmp_path):
+    store = JsonStore(tmp_path / "cities.json", debounce=60)
+    cities = ["Paris"]
+    store.save(cities)
+    cities.append("Tokyo")  # later changes do not leak into the snapshot
+
+    store.flush()
+    assert store.load() == ["Paris"]
+
+
+def test_a_burst_of_saves_costs_one_write(tmp_path, monkeypatch):
+    store = JsonStore(tmp_path / "cities.json", debounce=60)
+    writes = []
+    monkeypatch.setattr(store, "_write", writes.append)
+
+    for n in range(5):
+        store.save(list(range(n)))
+    store.flush()
+    store.flush()  # nothing pending
+
+    assert writes == [json.dumps([0, 1, 2, 3])]
+
+
+def test_write_replaces_the_file_atomically(tmp_path):
+    store = JsonStore(tmp_path / "cities.json", debounce=60)
+    store.path.write_text('["old"]')
+    store.save(["new"])
+    store.flush()
+
+    assert store.load() == ["new"]
+    assert [p.name for p in tmp_path.iterdir()] == ["cities.json"]  # no temp file left
+
+
+def test_corrupt_file_is_moved_aside(tmp_path):
+    store = JsonStore(tmp_path / "cities.json")
+    store.path.write_text('["Paris", ')
+
+    assert store.load() == []
+    assert not store.path.exists()
+    assert (tmp_path / "cities.json.corrupt").read_text() == '["Paris", '
+
+
+def test_value_of_the_wrong_type_is_moved_aside(tmp_path):
+    store = JsonStore(tmp_path / "history.json", default_factory=list)
+    store.path.write_text('{"Paris": 1}')
+
+    assert store.load() == []
+    assert (tmp_path / "history.json.corrupt").exists()
+
+
+def test_missing_file_gives_the_default(tmp_path):
+    assert JsonStore(tmp_path / "none.json", default_factory=dict).load() == {}
@@ -0,0 +1,57 @@
+"""Background refresh scheduler."""
+
+import asyncio
+import threading
+
+from refresh_scheduler import RefreshScheduler
+
+
+class FailingService:
+    """get_weather_many fails the first time, then returns nothing."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def get_weather_many(self, cities, force=False):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("boom")
+        return
+        yield
+
+
+def test_calls_from_handler_threads_run_on_the_loop():
+    async def run():
+        scheduler = RefreshScheduler(FailingService(), lambda city, weather: None)
+        scheduler.start()
+        scheduler.pause()
+        await asyncio.sleep(0)
+
+        # Flet runs sync handlers in worker threads
+        worker = threading.Thread(target=scheduler.resume)
+        worker.start()
+        worker.join()
+        await asyncio.wait_for(scheduler._running.wait(), 1)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_a_failed_round_does_not_stop_refreshing(monkeypatch):
+    monkeypatch.setattr("config.Config.REFRESH_MIN_INTERVAL", 0)
+
+    async def run():
+        service = FailingService()
+        scheduler = RefreshScheduler(service, lambda city, weather: None)
+        scheduler.start()
+        scheduler.add("Paris")
+        scheduler.entries["Paris"].due = 0
+        for _ in range(20):
+            await asyncio.sleep(0)
+        task = scheduler._task
+        await scheduler.stop()
+        return service.calls, task
+
+    calls, task = asyncio.run(run())
+    assert calls == 1
+    assert task.cancelled()  # still running until stopped, not dead
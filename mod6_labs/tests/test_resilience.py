@@ -0,0 +1,111 @@
+"""Retry policy, circuit breaker and token bucket."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, TokenBucket
+from weather_service import WeatherServiceError
+
+
+def test_retry_delay_stays_within_backoff_window():
+    policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=4.0)
+    for attempt in range(6):
+        window = min(4.0, 0.5 * 2 ** attempt)
+        assert all(0 <= policy.delay(attempt) <= window for _ in range(50))
+
+
+def test_retry_after_wins_but_is_capped():
+    policy = RetryPolicy(base_delay=0.5, max_delay=8.0)
+    assert policy.delay(0, retry_after=3) == 3
+    assert policy.delay(0, retry_after=120) == 8.0
+
+
+def test_breaker_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_breaker_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_opens_after_timeout_with_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.advance(29)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.advance(1)
+    breaker.before_request()  # the trial request
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_breaker_reopens_when_the_trial_fails(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.advance(30)
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_bucket_allows_a_burst_then_refills(clock):
+    bucket = TokenBucket(calls_per_minute=60, burst=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    # 57 tokens a minute on top of the burst of 3
+    clock.advance(60 / 57)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_bucket_pause_holds_back_every_request(clock):
+    bucket = TokenBucket(calls_per_minute=60, burst=3)
+    bucket.pause(10)
+    assert not bucket.try_acquire()
+    clock.advance(10)
+    assert bucket.try_acquire()
+
+
+def test_429_pauses_the_rate_limiter(make_service):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "5"})
+
+    async def run():
+        async with make_service(handler) as service:
+            with pytest.raises(WeatherServiceError):
+                await service.get_weather("London")
+            return service.rate_limiter
+
+    bucket = asyncio.run(run())
+    assert len(calls) == 1
+    assert not bucket.try_acquire()
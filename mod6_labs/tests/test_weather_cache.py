@@ -0,0 +1,65 @@
+"""Response cache states, eviction, and stale-while-revalidate in the service."""
+
+import asyncio
+
+import httpx
+
+from config import Config
+from weather_cache import FRESH, MISS, STALE, ResponseCache
+
+from .helpers import weather_json
+
+
+def test_entry_goes_fresh_then_stale_then_missing(clock):
+    cache = ResponseCache(max_entries=10, max_stale=60)
+    cache.set("k", "v", ttl=10)
+    assert cache.get("k") == (FRESH, "v")
+
+    clock.advance(10)
+    assert cache.get("k") == (STALE, "v")
+
+    clock.advance(60)
+    assert cache.get("k") == (MISS, None)
+    assert "k" not in cache
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+    cache.get("a")  # "b" is now the oldest
+    cache.set("c", 3, ttl=10)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(make_service, clock):
+    requests = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) > 1:
+            await release.wait()  # keep the refresh on the wire
+        return httpx.Response(200, json=weather_json("Paris", temp=len(requests)))
+
+    async def run():
+        async with make_service(handler) as service:
+            first = await service.get_weather("Paris")
+            clock.advance(Config.CACHE_TTL_WEATHER)
+
+            stale = await asyncio.gather(*(service.get_weather("Paris") for _ in range(5)))
+            assert all(weather == first for weather in stale)
+            await asyncio.sleep(0)
+            assert len(requests) == 2  # one refresh, however many readers
+            assert len(service._refreshing) == 1
+
+            release.set()
+            await asyncio.gather(*service._refreshing.values())
+            return first, await service.get_weather("Paris")
+
+    first, refreshed = asyncio.run(run())
+    assert first.temp == 1
+    assert refreshed.temp == 2
+    assert len(requests) == 2
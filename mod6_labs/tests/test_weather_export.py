@@ -0,0 +1,72 @@
+"""Bulk export CLI."""
+
+import asyncio
+import json
+import types
+
+import httpx
+import pytest
+
+import weather_export
+from weather_export import LineSet, load_checkpoint
+from weather_service import WeatherService
+
+from .helpers import weather_json
+
+
+def test_line_set():
+    done = LineSet()
+    for line in (1, 8, 9, 1000):
+        done.add(line)
+    done.add(8)
+
+    assert len(done) == 4
+    assert 8 in done and 1000 in done
+    assert 2 not in done and 10_000 not in done
+
+
+def test_checkpoint_ignores_a_half_written_last_line(tmp_path):
+    path = tmp_path / "export.ckpt"
+    path.write_text("3\n1\n2")
+    done = load_checkpoint(path)
+    assert (1 in done, 3 in done, 2 in done) == (True, True, False)
+
+
+def test_old_checkpoint_is_rejected(tmp_path):
+    path = tmp_path / "export.ckpt"
+    path.write_text("Paris\n")
+    with pytest.raises(ValueError, match="not an export checkpoint"):
+        load_checkpoint(path)
+
+
+def test_resume_retries_transient_failures_without_duplicates(
+    make_service, tmp_path, monkeypatch
+):
+    down = {"Lima"}
+
+    def handler(request):
+        city = request.url.params["q"]
+        if city in down:
+            return httpx.Response(503)
+        return httpx.Response(200, json=weather_json(city))
+
+    def service(persist=True):
+        # make_service's settings, with the export's own persist choice
+        return WeatherService(transport=httpx.MockTransport(handler), persist=persist)
+
+    make_service(handler)
+    monkeypatch.setattr(weather_export, "WeatherService", service)
+    (tmp_path / "cities.txt").write_text("Paris\nLima\n# comment\nTokyo\n")
+    args = types.SimpleNamespace(
+        input=str(tmp_path / "cities.txt"), output=str(tmp_path / "out.ndjson"),
+        format="ndjson", forecast=False, concurrency=2,
+        checkpoint=str(tmp_path / "export.ckpt"),
+    )
+
+    assert asyncio.run(weather_export.export(args)) == 1
+    down.clear()
+    assert asyncio.run(weather_export.export(args)) == 0
+
+    lines = (tmp_path / "out.ndjson").read_text().splitlines()
+    assert sorted(json.loads(line)["query"] for line in lines) == ["Lima", "Paris", "Tokyo"]
+    assert not (tmp_path / "cache.db").exists()  # the app's disk cache is untouched
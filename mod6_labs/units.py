@@ -0,0 +1,71 @@
+"""
+Display units.
+
+Every request asks OpenWeatherMap for metric data (CANONICAL), so cached
+responses are shared by every unit preference. Temperatures and wind
+speeds are converted only when they are displayed, and switching units
+re-renders what is already on screen without a request.
+"""
+
+from typing import Dict
+
+CANONICAL = "metric"  # units of every fetched (and cached) response
+
+# Cycled through by the unit toggle, in this order
+UNIT_SYSTEMS = ("metric", "imperial", "standard")
+
+TEMPERATURE_SYMBOLS: Dict[str, str] = {
+    "metric": "°C",
+    "imperial": "°F",
+    "standard": "K",
+}
+SPEED_SYMBOLS: Dict[str, str] = {
+    "metric": "m/s",
+    "imperial": "mph",
+    "standard": "m/s",
+}
+
+MPH_PER_MS = 2.236936
+
+
+def check_units(units: str) -> str:
+    """
+    Raises:
+        ValueError: If the unit system is unknown
+    """
+    if units not in UNIT_SYSTEMS:
+        raise ValueError(
+            f"Unknown units '{units}' (expected one of {', '.join(UNIT_SYSTEMS)})"
+        )
+    return units
+
+
+def next_units(units: str) -> str:
+    """The unit system after ``units`` in the toggle's cycle."""
+    return UNIT_SYSTEMS[(UNIT_SYSTEMS.index(units) + 1) % len(UNIT_SYSTEMS)]
+
+
+def convert_temperature(celsius: float, units: str) -> float:
+    if units == "imperial":
+        return celsius * 9 / 5 + 32
+    if units == "standard":
+        return celsius + 273.15
+    return celsius
+
+
+def convert_speed(meters_per_second: float, units: str) -> float:
+    if units == "imperial":
+        return meters_per_second * MPH_PER_MS
+    return meters_per_second
+
+
+def format_temperature(celsius: float, units: str) -> str:
+    """Format a metric temperature in ``units``, e.g. "21.5°C" or "294.6 K"."""
+    symbol = TEMPERATURE_SYMBOLS[units]
+    separator = " " if units == "standard" else ""
+    return f"{convert_temperature(celsius, units):.1f}{separator}{symbol}"
+
+
+def format_speed(meters_per_second: float, units: str) -> str:
+    """Format a metric wind speed in ``units``, e.g. "3.6 m/s" or "8.1 mph"."""
+    return f"{convert_speed(meters_per_second, units):.1f} {SPEED_SYMBOLS[units]}"
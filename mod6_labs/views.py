@@ -0,0 +1,497 @@
+"""Reusable views of the weather app, updated in place."""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import flet as ft
+
+from config import Config
+from icon_store import icons
+from models import CurrentWeather, DailySummary
+from units import format_speed, format_temperature
+
+FORECAST_DAYS = 5
+
+
+def format_age(timestamp: float) -> str:
+    """Describe how long ago a timestamp was, e.g. "5 min ago"."""
+    minutes = int((time.time() - timestamp) // 60)
+    if minutes < 1:
+        return "just now"
+    if minutes < 60:
+        return f"{minutes} min ago"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} h ago"
+    return f"{hours // 24} d ago"
+
+
+async def fade_in(container: ft.Container):
+    """
+    Show a container with a short fade.
+
+    Only the container is updated, so the first update carries its new
+    values and the second one nothing but the opacity.
+    """
+    container.animate_opacity = 300
+    container.opacity = 0
+    container.visible = True
+    container.update()
+
+    await asyncio.sleep(0.1)
+    container.opacity = 1
+    container.update()
+
+
+class CityCard(ft.Container):
+    """Card of one saved city; its controls are built once and then updated."""
+
+    def __init__(self, city: str, on_remove: Callable[[str], None], units: str = Config.UNITS):
+        """
+        Args:
+            city: Saved city key the card was created for
+            on_remove: Called with the city key when the delete button is clicked
+            units: Units to display the temperatures in
+        """
+        self.city = city
+        self.units = units
+        self.weather: Optional[CurrentWeather] = None
+        self.icon_image = ft.Image(width=50, height=50)
+        self.name_text = ft.Text(size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_800)
+        # Shown when the card holds cached data
+        self.age_text = ft.Text(size=10, color=ft.Colors.ORANGE_700, visible=False)
+        self.temp_text = ft.Text(size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700)
+        self.temp_min_text = ft.Text(size=12, color=ft.Colors.GREY_600)
+        self.temp_max_text = ft.Text(size=12, color=ft.Colors.GREY_600)
+
+        super().__init__(
+            padding=10,
+            border_radius=10,
+            bgcolor=ft.Colors.WHITE,
+            shadow=ft.BoxShadow(
+                spread_radius=1,
+                blur_radius=3,
+                color=ft.Colors.with_opacity(0.15, ft.Colors.BLACK),
+            ),
+            content=ft.Row(
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=15,
+                controls=[
+                    # Left side: Weather icon
+                    self.icon_image,
+
+                    # City + Country, with a badge when showing cached data
+                    ft.Column(spacing=0, controls=[self.name_text, self.age_text]),
+
+                    # Current Temp
+                    self.temp_text,
+
+                    # Min Temp with Down Arrow
+                    ft.Row(
+                        spacing=2,
+                        controls=[
+                            ft.Icon(ft.Icons.ARROW_DOWNWARD, size=16, color=ft.Colors.BLUE_500),
+                            self.temp_min_text,
+                        ]
+                    ),
+
+                    # Max Temp with Up Arrow
+                    ft.Row(
+                        spacing=2,
+                        controls=[
+                            ft.Icon(ft.Icons.ARROW_UPWARD, size=16, color=ft.Colors.BLUE_500),
+                            self.temp_max_text,
+                        ]
+                    ),
+
+                    # Delete button
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE,
+                        icon_size=22,
+                        icon_color=ft.Colors.RED_600,
+                        tooltip="Remove city",
+                        on_click=lambda e: on_remove(self.city),
+                    ),
+                ],
+            ),
+        )
+
+    def set_weather(self, weather: CurrentWeather):
+        """Show new data; only the changed values are sent on the next update."""
+        self.weather = weather
+        icons().apply(self.icon_image, weather.icon)
+        self.name_text.value = f"{weather.name}, {weather.country}"
+        self.age_text.value = f"Updated {format_age(weather.cached_at)}" if weather.cached_at else ""
+        self.age_text.visible = weather.cached_at is not None
+        self._show_temperatures()
+
+    def set_units(self, units: str):
+        """Show the data already held in other units."""
+        self.units = units
+        if self.weather:
+            self._show_temperatures()
+
+    def _show_temperatures(self):
+        weather = self.weather
+        self.temp_text.value = format_temperature(weather.temp, self.units)
+        self.temp_min_text.value = format_temperature(weather.temp_min, self.units)
+        self.temp_max_text.value = format_temperature(weather.temp_max, self.units)
+
+
+class CityCardRegistry:
+    """
+    Saved city cards, keyed by city ID.
+
+    Cards are created once and updated in place. Changes only mark the
+    registry dirty; flush() sends all of them in a single page.update(),
+    so loading or refreshing many cities costs one round-trip to the
+    client. Saved names that resolve to the same city share one card.
+    """
+
+    def __init__(self, page: ft.Page, column: ft.Column, on_remove: Callable[[str], None]):
+        """
+        Args:
+            page: Page to update on flush()
+            column: Column holding the cards
+            on_remove: Called with a saved city key when its card's delete
+                button is clicked
+        """
+        self.page = page
+        self.column = column
+        self.on_remove = on_remove
+        self.cards: Dict[int, CityCard] = {}
+        self.city_ids: Dict[str, int] = {}  # saved city key -> city ID
+        self.units = Config.UNITS
+        self._dirty = False
+
+    def show(self, city: str, weather: CurrentWeather):
+        """Create or update the card of a saved city (sent on the next flush)."""
+        old_id = self.city_ids.get(city)
+        if old_id is not None and old_id != weather.city_id:
+            # The name now resolves to another city
+            self.remove(city)
+
+        card = self.cards.get(weather.city_id)
+        if card is None:
+            card = self.cards[weather.city_id] = CityCard(city, self.on_remove, self.units)
+            self.column.controls.append(card)
+        self.city_ids[city] = weather.city_id
+        card.set_weather(weather)
+        self._dirty = True
+
+    def remove(self, city: str) -> List[str]:
+        """
+        Remove the card of a saved city.
+
+        Returns:
+            Every saved city key that shared the removed card
+        """
+        city_id = self.city_ids.get(city)
+        card = self.cards.pop(city_id, None)
+        if card is None:
+            return [city]
+        keys = [key for key, key_id in self.city_ids.items() if key_id == city_id]
+        for key in keys:
+            del self.city_ids[key]
+        self.column.controls.remove(card)
+        self._dirty = True
+        return keys
+
+    def keys_in_rows(self, first: int, last: int) -> List[str]:
+        """Saved city keys of the cards shown in rows first..last (inclusive)."""
+        on_screen = {id(card) for card in self.column.controls[first:last + 1]}
+        return [
+            key for key, city_id in self.city_ids.items()
+            if id(self.cards[city_id]) in on_screen
+        ]
+
+    def set_units(self, units: str):
+        """Show every card in other units (sent on the next flush)."""
+        self.units = units
+        for card in self.cards.values():
+            card.set_units(units)
+        self._dirty = True
+
+    def flush(self):
+        """Send every pending card change in one page update."""
+        if self._dirty:
+            self._dirty = False
+            self.page.update()
+
+    def __contains__(self, city: str):
+        return city in self.city_ids
+
+
+class InfoCard(ft.Container):
+    """Small tile with an icon, a label and a value."""
+
+    def __init__(self, icon: str, label: str):
+        self.value_text = ft.Text(size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900)
+        super().__init__(
+            content=ft.Column(
+                [
+                    ft.Icon(icon, size=30, color=ft.Colors.BLUE_700),
+                    ft.Text(label, size=12, color=ft.Colors.GREY_600),
+                    self.value_text,
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=5,
+            ),
+            bgcolor=ft.Colors.WHITE,
+            border_radius=10,
+            padding=15,
+            width=150,
+        )
+
+
+class CurrentWeatherView(ft.Container):
+    """Current conditions panel, built once and updated for every search."""
+
+    def __init__(self, units: str = Config.UNITS):
+        self.units = units
+        self.weather: Optional[CurrentWeather] = None
+        self.location_text = ft.Text(size=24, weight=ft.FontWeight.BOLD)
+        # Shown when the data comes from the offline cache
+        self.offline_text = ft.Text(size=12, color=ft.Colors.ORANGE_700, visible=False)
+        self.icon_image = ft.Image(width=100, height=100)
+        self.description_text = ft.Text(size=20, italic=True)
+        self.temperature_text = ft.Text(size=48, weight=ft.FontWeight.BOLD)
+        self.feels_like_text = ft.Text(size=16)
+        self.temp_min_text = ft.Text(size=14)
+        self.temp_max_text = ft.Text(size=14)
+        self.humidity = InfoCard(ft.Icons.WATER_DROP, "Humidity")
+        self.wind = InfoCard(ft.Icons.AIR, "Wind Speed")
+        self.pressure = InfoCard(ft.Icons.COMPRESS, "Pressure")
+        self.clouds = InfoCard(ft.Icons.CLOUD, "Cloudiness")
+
+        super().__init__(
+            bgcolor=ft.Colors.BLUE_50,
+            border_radius=10,
+            padding=20,
+            visible=False,
+            content=ft.Column(
+                [
+                    # Location
+                    self.location_text,
+                    self.offline_text,
+
+                    # Weather icon and description
+                    self.icon_image,
+                    self.description_text,
+
+                    self.temperature_text,
+                    self.feels_like_text,
+
+                    ft.Row(
+                        [
+                            ft.Row(
+                                [ft.Icon(ft.Icons.ARROW_DOWNWARD, size=14), self.temp_min_text],
+                                spacing=3
+                            ),
+                            ft.Row(
+                                [ft.Icon(ft.Icons.ARROW_UPWARD, size=14), self.temp_max_text],
+                                spacing=3
+                            ),
+                        ],
+                        spacing=10
+                    ),
+
+                    ft.Divider(),
+
+                    # Additional info
+                    ft.Row(
+                        [self.humidity, self.wind],
+                        expand=2,
+                        alignment=ft.MainAxisAlignment.CENTER,
+                    ),
+                    ft.Row(
+                        [self.pressure, self.clouds],
+                        expand=True,
+                        alignment=ft.MainAxisAlignment.CENTER
+                    ),
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=7
+            ),
+        )
+
+    def set_weather(self, weather: CurrentWeather):
+        """Put new values into the existing controls."""
+        self.weather = weather
+        self.location_text.value = f"{weather.name}, {weather.country}"
+        self.offline_text.value = (
+            f"Offline - last updated {format_age(weather.cached_at)}" if weather.cached_at else ""
+        )
+        self.offline_text.visible = weather.cached_at is not None
+        icons().apply(self.icon_image, weather.icon)
+        self.description_text.value = weather.description
+        self.humidity.value_text.value = f"{weather.humidity}%"
+        self.pressure.value_text.value = f"{weather.pressure} hPa"
+        self.clouds.value_text.value = f"{weather.clouds}%"
+        self._show_units()
+
+    def set_units(self, units: str):
+        """Show the data already held in other units."""
+        self.units = units
+        if self.weather:
+            self._show_units()
+
+    def _show_units(self):
+        weather, units = self.weather, self.units
+        self.temperature_text.value = format_temperature(weather.temp, units)
+        self.feels_like_text.value = f"Feels like {format_temperature(weather.feels_like, units)}"
+        self.temp_min_text.value = format_temperature(weather.temp_min, units)
+        self.temp_max_text.value = format_temperature(weather.temp_max, units)
+        self.wind.value_text.value = format_speed(weather.wind_speed, units)
+
+
+class ForecastDayCard(ft.Container):
+    """One day of the 5-day forecast."""
+
+    def __init__(self):
+        self.day_text = ft.Text(color=ft.Colors.BLACK, weight=ft.FontWeight.W_500)
+        self.icon_image = ft.Image(width=80, height=80)
+        self.temp_text = ft.Text(size=24, weight=ft.FontWeight.W_500, color=ft.Colors.BLUE_900)
+        self.temp_min_text = self._info_text()
+        self.temp_max_text = self._info_text()
+
+        super().__init__(
+            content=ft.Column(
+                [
+                    self.day_text,
+                    self.icon_image,
+                    self.temp_text,
+                    ft.Column(
+                        [
+                            self._info_row(ft.Icons.ARROW_DOWNWARD, self.temp_min_text),
+                            self._info_row(ft.Icons.ARROW_UPWARD, self.temp_max_text),
+                        ],
+                        spacing=10,
+                        alignment=ft.MainAxisAlignment.CENTER
+                    )
+                ],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=20,
+                expand=True
+            ),
+            expand=True,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=10,
+            padding=15,
+            width=130,
+        )
+
+    @staticmethod
+    def _info_text() -> ft.Text:
+        return ft.Text(size=12, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900)
+
+    @staticmethod
+    def _info_row(icon: str, text: ft.Text) -> ft.Row:
+        return ft.Row(
+            [ft.Icon(icon, size=14, color=ft.Colors.BLUE_500), text],
+            expand=True,
+            alignment=ft.MainAxisAlignment.CENTER
+        )
+
+    def set_day(
+        self, label: str, icon_code: str, temp: float, min_temp: float, max_temp: float,
+        units: str,
+    ):
+        """Put new values (metric temperatures) into the existing controls."""
+        self.day_text.value = label
+        icons().apply(self.icon_image, icon_code)
+        self.temp_text.value = format_temperature(temp, units)
+        self.temp_min_text.value = format_temperature(min_temp, units)
+        self.temp_max_text.value = format_temperature(max_temp, units)
+
+
+class ForecastView(ft.Container):
+    """
+    Multi-city overview and 5-day forecast panel, built once.
+
+    The saved cities are always shown, so cards drawn from the cache at
+    startup are visible before any search; the forecast part
+    (``forecast_section``) is only shown once a forecast is loaded.
+    """
+
+    def __init__(
+        self, cities_panel: ft.Control, on_add_city: Callable, units: str = Config.UNITS
+    ):
+        """
+        Args:
+            cities_panel: Control holding the saved city cards
+            on_add_city: Click handler of the "Add City" button
+            units: Units to display the temperatures in
+        """
+        self.units = units
+        self.days: Sequence[DailySummary] = ()
+        self.current: Optional[CurrentWeather] = None
+        self.day_cards = [ForecastDayCard() for _ in range(FORECAST_DAYS)]
+        self.forecast_section = ft.Container(
+            visible=False,
+            content=ft.Column(
+                [
+                    ft.Text(
+                        "5-Day Forecast",
+                        size=24,
+                        weight=ft.FontWeight.BOLD,
+                    ),
+                    ft.Divider(),
+                    ft.Row(controls=self.day_cards, expand=True, spacing=10),
+                ]
+            ),
+        )
+
+        super().__init__(
+            bgcolor=ft.Colors.BLUE_50,
+            border_radius=10,
+            padding=20,
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [
+                            ft.Text("Multi-City Overview", size=24, weight=ft.FontWeight.BOLD),
+                            ft.IconButton(
+                                icon=ft.Icons.ADD,
+                                tooltip="Add City",
+                                on_click=on_add_city
+                            )
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                    ),
+                    cities_panel,
+                    self.forecast_section,
+                ]
+            ),
+        )
+
+    def set_days(self, days: Sequence[DailySummary], current: Optional[CurrentWeather] = None):
+        """
+        Show up to five days; cards without a day are hidden.
+
+        Today's card uses the current conditions when they are given.
+        """
+        self.days, self.current = days, current
+        for i, card in enumerate(self.day_cards):
+            card.visible = i < len(days)
+            if not card.visible:
+                continue
+            day = days[i]
+            icon_code, temperature = day.icon, day.temp_mean
+            if i == 0 and current:
+                icon_code, temperature = current.icon, current.temp
+            card.set_day(
+                day.date.strftime('%A').upper(),
+                icon_code,
+                temperature,
+                day.temp_min,
+                day.temp_max,
+                self.units,
+            )
+
+    def set_units(self, units: str):
+        """Show the days already held in other units."""
+        self.units = units
+        self.set_days(self.days, self.current)
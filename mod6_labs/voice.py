@@ -0,0 +1,231 @@
+"""
+Voice search: speech recognizers, sound cues and the hand-off to the UI.
+
+Recognizers listen on their own threads. Everything they hear is passed to
+the event loop through an asyncio queue (loop.call_soon_threadsafe), so
+Flet controls are only touched from the loop and nothing blocks it.
+"""
+
+import asyncio
+import itertools
+from abc import ABC, abstractmethod
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Awaitable, Callable, List, Optional, Union
+
+from config import Config
+
+TextCallback = Callable[[str], None]
+ErrorCallback = Callable[[Exception], None]
+
+
+class Recognizer(ABC):
+    """
+    Interface of a speech recognizer.
+
+    start() begins listening in the background and returns at once; the
+    callbacks may be called from any thread. A backend missing either
+    method cannot be instantiated.
+    """
+
+    @abstractmethod
+    def start(self, on_text: TextCallback, on_error: ErrorCallback):
+        """Begin listening; returns at once."""
+
+    @abstractmethod
+    def stop(self):
+        """Stop listening (safe to call more than once)."""
+
+
+class SpeechRecognitionRecognizer(Recognizer):
+    """Microphone input recognized by Google through the SpeechRecognition package."""
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: If SpeechRecognition is not installed
+        """
+        import speech_recognition as sr
+
+        self.sr = sr
+        self.recognizer = sr.Recognizer()
+        self._stop_listening: Optional[Callable] = None
+        self._stopped = False
+
+    def start(self, on_text: TextCallback, on_error: ErrorCallback):
+        self._stopped = False
+
+        def callback(recognizer, audio):
+            try:
+                text = recognizer.recognize_google(audio)
+            except self.sr.UnknownValueError:
+                return  # ignore noise
+            except Exception as e:
+                on_error(e)
+                return
+            on_text(text)
+
+        def listen():
+            # Opening the microphone is slow, so it happens off the event loop
+            try:
+                mic = self.sr.Microphone()
+                self._stop_listening = self.recognizer.listen_in_background(mic, callback)
+            except Exception as e:
+                on_error(e)
+                return
+            if self._stopped:
+                self.stop()
+
+        threading.Thread(target=listen, daemon=True).start()
+
+    def stop(self):
+        self._stopped = True
+        if self._stop_listening:
+            self._stop_listening(wait_for_stop=False)
+            self._stop_listening = None
+
+
+class OfflineRecognizer(Recognizer):
+    """
+    Stand-in that "hears" preset phrases, for testing without a microphone.
+
+    Each start() answers with the next phrase after a delay, from a timer
+    thread, just like a real recognizer would.
+    """
+
+    def __init__(self, phrases: List[str], delay: float = 1.0):
+        self.phrases = itertools.cycle(phrases or ["London"])
+        self.delay = delay
+        self._timer: Optional[threading.Timer] = None
+
+    def start(self, on_text: TextCallback, on_error: ErrorCallback):
+        self.stop()
+        self._timer = threading.Timer(self.delay, on_text, args=(next(self.phrases),))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+def create_recognizer() -> Recognizer:
+    """
+    Build the recognizer selected by Config.VOICE_RECOGNIZER.
+
+    Raises:
+        ImportError: If the "google" recognizer's package is missing
+        ValueError: If the recognizer name is unknown
+    """
+    if Config.VOICE_RECOGNIZER == "google":
+        return SpeechRecognitionRecognizer()
+    if Config.VOICE_RECOGNIZER == "offline":
+        return OfflineRecognizer(Config.VOICE_OFFLINE_PHRASES)
+    raise ValueError(
+        f"Unknown WEATHER_VOICE_RECOGNIZER '{Config.VOICE_RECOGNIZER}' "
+        "(expected google or offline)"
+    )
+
+
+# Running sound players, kept referenced until they exit
+_players = set()
+
+
+async def play_sound(path: str):
+    """
+    Start playing a sound and return without waiting for it to finish.
+
+    Uses winsound on Windows, afplay on macOS and paplay or aplay on Linux;
+    does nothing where none of them is available.
+    """
+    if sys.platform == "win32":
+        import winsound
+
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        return
+
+    candidates = ("afplay",) if sys.platform == "darwin" else ("paplay", "aplay")
+    player = next((name for name in candidates if shutil.which(name)), None)
+    if player is None:
+        return
+    try:
+        process = await asyncio.create_subprocess_exec(
+            player, path,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return
+    # Reap the player in the background
+    task = asyncio.create_task(process.wait())
+    _players.add(task)
+    task.add_done_callback(_players.discard)
+
+
+class VoicePipeline:
+    """
+    Runs one recognizer and delivers what it hears on the event loop.
+
+    Recognized text and errors are queued from the recognizer's thread;
+    a consumer task on the loop awaits the handlers one by one.
+    """
+
+    def __init__(
+        self,
+        recognizer: Recognizer,
+        on_text: Callable[[str], Awaitable[None]],
+        on_error: Callable[[Exception], Awaitable[None]],
+    ):
+        """
+        Args:
+            recognizer: Recognizer to listen with
+            on_text: Awaited on the loop with the first text heard
+            on_error: Awaited on the loop when recognition fails
+        """
+        self.recognizer = recognizer
+        self.on_text = on_text
+        self.on_error = on_error
+        self.listening = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: "asyncio.Queue[Union[str, Exception]]" = asyncio.Queue()
+        self._consumer: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start listening (call from the event loop)."""
+        self._loop = asyncio.get_running_loop()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume())
+        self.listening = True
+        self.recognizer.start(self._put, self._put)
+
+    def stop(self):
+        """Stop listening; anything still queued is dropped."""
+        self.listening = False
+        self.recognizer.stop()
+
+    def close(self):
+        """Stop listening and end the consumer task."""
+        self.stop()
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+
+    def _put(self, item: Union[str, Exception]):
+        """Queue a result; safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    async def _consume(self):
+        while True:
+            item = await self._queue.get()
+            if not self.listening:
+                continue
+            if isinstance(item, Exception):
+                await self.on_error(item)
+                continue
+            # Only the first phrase is used
+            self.stop()
+            await self.on_text(item)
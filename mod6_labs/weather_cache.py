@@ -0,0 +1,72 @@
+"""In-memory response cache for the weather service."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Cache lookup states
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with per-entry time-to-live.
+
+    An entry is "fresh" until its TTL runs out, then "stale" for another
+    ``max_stale`` seconds. Stale entries can still be shown to the user
+    while a fresh copy is fetched in the background.
+    """
+
+    def __init__(self, max_entries: int = 256, max_stale: float = 3600):
+        self.max_entries = max_entries
+        self.max_stale = max_stale
+        # key -> (value, fresh_until, stale_until)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Tuple[str, Optional[Any]]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (state, value) where state is FRESH, STALE or MISS
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS, None
+
+        value, fresh_until, stale_until = entry
+        now = time.monotonic()
+        if now >= stale_until:
+            del self._entries[key]
+            return MISS, None
+
+        self._entries.move_to_end(key)
+        return (FRESH if now < fresh_until else STALE), value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Store a value, evicting the least recently used entry if full."""
+        now = time.monotonic()
+        self._entries[key] = (value, now + ttl, now + ttl + self.max_stale)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Remove a single entry."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
@@ -0,0 +1,247 @@
+"""
+Headless bulk export of current weather (and optionally forecasts).
+
+Reads one city per line from a file or stdin, fetches them concurrently
+through WeatherService and writes one record per city, in completion
+order, as NDJSON or CSV. Cities the API could not answer for the moment
+(timeouts, 5xx) are reported on stderr instead, and retried on resume.
+The checkpoint records finished input line numbers, so a resume needs the
+same input; it is read back as a bitmap, one bit per line.
+
+    python weather_export.py cities.txt -o weather.ndjson
+    cat cities.txt | python weather_export.py - --format csv --forecast
+    python weather_export.py cities.txt -o weather.ndjson --checkpoint export.ckpt
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from config import Config
+from forecast import aggregate_daily
+from models import CurrentWeather, DailySummary
+from weather_service import (
+    ServiceUnavailableError,
+    WeatherService,
+    WeatherServiceError,
+)
+
+FORECAST_DAYS = 5
+CURRENT_FIELDS = [
+    field for field in CurrentWeather._fields if field != "cached_at"
+]
+
+
+class LineSet:
+    """Set of line numbers stored as a bitmap, one bit per line."""
+
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+
+    def add(self, line: int):
+        index, mask = line >> 3, 1 << (line & 7)
+        if index >= len(self.bits):
+            self.bits.extend(bytes(index + 1 - len(self.bits)))
+        if not self.bits[index] & mask:
+            self.bits[index] |= mask
+            self.count += 1
+
+    def __contains__(self, line: int) -> bool:
+        index = line >> 3
+        return index < len(self.bits) and bool(self.bits[index] & (1 << (line & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def load_checkpoint(path: Path) -> LineSet:
+    """Stream a checkpoint file into the set of finished line numbers."""
+    done = LineSet()
+    with open(path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # cut off mid-write
+            try:
+                done.add(int(line))
+            except ValueError:
+                raise ValueError(f"{path} is not an export checkpoint") from None
+    return done
+
+
+def read_cities(source: TextIO, skip: LineSet) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, city) one line at a time, skipping blanks,
+    comments and lines finished by an earlier run.
+    """
+    for number, line in enumerate(source, start=1):
+        city = line.strip()
+        if city and not city.startswith("#") and number not in skip:
+            yield number, city
+
+
+def build_record(
+    city: str,
+    weather: Optional[CurrentWeather],
+    days: Optional[List[DailySummary]],
+    error: Optional[Exception],
+) -> Dict:
+    """Flatten one result into an output record."""
+    record = {"query": city, "error": str(error) if error else ""}
+    if weather is not None:
+        record.update((field, getattr(weather, field)) for field in CURRENT_FIELDS)
+    if days is not None:
+        record["forecast"] = [
+            {**day._asdict(), "date": day.date.isoformat()} for day in days
+        ]
+    return record
+
+
+class RecordWriter:
+    """Write records as NDJSON or CSV, flushing after every record."""
+
+    def __init__(self, out: TextIO, fmt: str, with_forecast: bool, write_header: bool):
+        self.out = out
+        self.fmt = fmt
+        if fmt == "csv":
+            fields = ["query", "error"] + CURRENT_FIELDS
+            if with_forecast:
+                for n in range(1, FORECAST_DAYS + 1):
+                    fields += [f"day{n}_date", f"day{n}_min", f"day{n}_max", f"day{n}_icon"]
+            self.csv = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+            if write_header:
+                self.csv.writeheader()
+
+    def write(self, record: Dict):
+        if self.fmt == "ndjson":
+            self.out.write(json.dumps(record) + "\n")
+        else:
+            for n, day in enumerate(record.get("forecast", [])[:FORECAST_DAYS], start=1):
+                record[f"day{n}_date"] = day["date"]
+                record[f"day{n}_min"] = day["temp_min"]
+                record[f"day{n}_max"] = day["temp_max"]
+                record[f"day{n}_icon"] = day["icon"]
+            self.csv.writerow(record)
+        self.out.flush()
+
+
+async def export(args) -> int:
+    """Run the export; returns the number of cities that failed."""
+    checkpoint = Path(args.checkpoint) if args.checkpoint else None
+    done = LineSet()
+    if checkpoint and checkpoint.exists():
+        done = load_checkpoint(checkpoint)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    if args.output == "-":
+        out = sys.stdout
+        write_header = True
+    else:
+        resuming = bool(done) and Path(args.output).exists()
+        out = open(args.output, "a" if resuming else "w", newline="")
+        write_header = not resuming
+    checkpoint_file = open(checkpoint, "a") if checkpoint else None
+
+    writer = RecordWriter(out, args.format, args.forecast, write_header)
+    # A bounded queue keeps memory constant however long the input is
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+    failed = 0
+
+    async def worker(service: WeatherService):
+        nonlocal failed
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            number, city = item
+
+            weather, days, error = None, None, None
+            try:
+                weather = await service.get_weather(city)
+                if args.forecast:
+                    days = aggregate_daily(await service.get_forecast(city))[:FORECAST_DAYS]
+            except WeatherServiceError as e:
+                error = e
+                failed += 1
+            finally:
+                # Each city is looked up once, so don't let its ID pile up
+                service.city_ids.pop(city.strip().casefold(), None)
+
+            # Transient failures are reported but neither written nor
+            # checkpointed, so a resume retries them without duplicates
+            if isinstance(error, ServiceUnavailableError):
+                print(f"{city}: {error}", file=sys.stderr)
+                continue
+
+            writer.write(build_record(city, weather, days, error))
+            if checkpoint_file:
+                checkpoint_file.write(f"{number}\n")
+                checkpoint_file.flush()
+
+    async def produce(workers: List[asyncio.Task]):
+        for item in read_cities(source, done):
+            await queue.put(item)
+        for _ in workers:
+            await queue.put(None)
+
+    try:
+        # The export's responses stay out of the app's disk cache
+        async with WeatherService(persist=False) as service:
+            workers = [
+                asyncio.create_task(worker(service)) for _ in range(args.concurrency)
+            ]
+            producer = asyncio.create_task(produce(workers))
+            # If the workers die, their error surfaces here instead of
+            # leaving the producer blocked on a full queue
+            try:
+                await asyncio.gather(producer, *workers)
+            finally:
+                for task in [producer, *workers]:
+                    task.cancel()
+    finally:
+        for f in (source, out, checkpoint_file):
+            if f not in (None, sys.stdin, sys.stdout):
+                f.close()
+
+    return failed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Export current weather for a list of cities."
+    )
+    parser.add_argument("input", help="file with one city per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--forecast", action="store_true", help="include a 5-day daily forecast")
+    parser.add_argument(
+        "--concurrency", type=int, default=Config.MAX_CONCURRENT_REQUESTS,
+        help="requests in flight at once",
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, default=Config.RATE_LIMIT_PER_MINUTE,
+        help="maximum API calls per minute",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="file recording finished input lines; rerun with the same input and file to resume",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    Config.validate()
+    Config.RATE_LIMIT_PER_MINUTE = args.rate_limit
+    failed = asyncio.run(export(args))
+    if failed:
+        print(f"{failed} cities failed", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
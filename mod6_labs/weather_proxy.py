@@ -0,0 +1,245 @@
+"""
+Headless weather proxy shared by many app clients.
+
+Serves the OpenWeatherMap paths the app uses (/data/2.5/weather, /forecast
+and /group) from one WeatherService, so every client shares a single
+connection pool, rate limit and response cache: N users looking at the same
+city cost one upstream call per TTL instead of N.
+
+    uvicorn weather_proxy:app --host 0.0.0.0 --port 8000
+    python weather_proxy.py
+
+Clients point at it through their .env; the proxy adds its own API key, so
+the clients' key is ignored (but must be set):
+
+    OPENWEATHER_BASE_URL="http://proxy-host:8000/data/2.5/weather"
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+
+from config import Config
+from weather_cache import ResponseCache, FRESH, STALE
+from units import CANONICAL
+from weather_service import (
+    ServiceUnavailableError,
+    WeatherService,
+    WeatherServiceError,
+)
+
+# Query parameters relayed upstream, per endpoint; anything else (including
+# the client's appid) is dropped and kept out of the cache key
+ALLOWED_PARAMS = {
+    "weather": ("q", "id", "lat", "lon", "units", "lang"),
+    "forecast": ("q", "id", "lat", "lon", "units", "lang", "cnt"),
+    "group": ("id", "units", "lang"),
+}
+TTLS = {
+    "weather": Config.CACHE_TTL_WEATHER,
+    "forecast": Config.CACHE_TTL_FORECAST,
+    "group": Config.CACHE_TTL_WEATHER,
+}
+
+# Cached response: (body, etag, expires_at as wall-clock time)
+Entry = Tuple[bytes, str, float]
+
+
+def normalize_params(endpoint: str, query) -> Tuple[Tuple[str, str], ...]:
+    """
+    Reduce a query string to the parameters that change the response.
+
+    City names are case-folded and coordinates rounded to two decimals
+    (about 1 km), so equivalent requests from different clients share one
+    cache entry and one upstream call.
+    """
+    params = {}
+    for name in ALLOWED_PARAMS[endpoint]:
+        value = query.get(name)
+        if value is None or not value.strip():
+            continue
+        value = value.strip()
+        if name == "q":
+            value = " ".join(value.casefold().split())
+        elif name in ("lat", "lon"):
+            try:
+                value = f"{float(value):.2f}"
+            except ValueError:
+                pass  # let the API reject it
+        elif name == "id":
+            value = ",".join(part.strip() for part in value.split(","))
+        params[name] = value
+    params.setdefault("units", CANONICAL)
+    return tuple(sorted(params.items()))
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Check an If-None-Match header (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class WeatherProxy:
+    """Shared cache in front of one WeatherService."""
+
+    def __init__(self, service: Optional[WeatherService] = None):
+        """
+        Args:
+            service: Upstream service (defaults to a new WeatherService)
+        """
+        self.service = service or WeatherService()
+        self.cache = ResponseCache(Config.PROXY_CACHE_MAX_ENTRIES, Config.CACHE_MAX_STALE)
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def close(self):
+        """Cancel background refreshes and close the upstream service."""
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        await self.service.close()
+
+    async def fetch(self, endpoint: str, params: Tuple[Tuple[str, str], ...]) -> Entry:
+        """
+        Return the cached response for a request, fetching it if needed.
+
+        Stale entries are served at once and refreshed in the background,
+        and kept serving while the upstream API is unavailable.
+
+        Raises:
+            WeatherServiceError: If there is nothing cached and the
+                upstream request fails
+        """
+        key = (endpoint, params)
+        state, entry = self.cache.get(key)
+        metrics = self.service.metrics
+        if state == FRESH:
+            if metrics:
+                metrics.record_cache(f"proxy_{endpoint}", "hit")
+            return entry
+        if state == STALE:
+            if metrics:
+                metrics.record_cache(f"proxy_{endpoint}", "stale")
+            if key not in self._refreshing:
+                task = asyncio.create_task(self._refresh(key))
+                self._refreshing[key] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+            return entry
+
+        if metrics:
+            metrics.record_cache(f"proxy_{endpoint}", "miss")
+        return await self._load(key)
+
+    async def _load(self, key: Hashable) -> Entry:
+        """Fetch a response upstream and cache it."""
+        endpoint, params = key
+        data = await self.service.get_raw(endpoint, dict(params))
+        body = json.dumps(data, separators=(",", ":")).encode()
+        ttl = TTLS[endpoint]
+        entry = (body, make_etag(body), time.time() + ttl)
+        self.cache.set(key, entry, ttl)
+        return entry
+
+    async def _refresh(self, key: Hashable):
+        try:
+            await self._load(key)
+        except WeatherServiceError:
+            pass  # keep serving the stale copy
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    Config.validate()
+    app.state.proxy = WeatherProxy()
+    await app.state.proxy.service.start()
+    try:
+        yield
+    finally:
+        await app.state.proxy.close()
+
+
+app = FastAPI(title=f"{Config.APP_TITLE} proxy", lifespan=lifespan)
+
+
+def error_response(error: WeatherServiceError) -> Response:
+    """Relay an upstream failure with the status the app's client expects."""
+    if error.status_code is not None:
+        status = error.status_code
+    elif isinstance(error, ServiceUnavailableError):
+        status = 503
+    else:
+        status = 502
+    body = json.dumps({"cod": status, "message": str(error)})
+    return Response(body, status_code=status, media_type="application/json")
+
+
+async def relay(endpoint: str, request: Request) -> Response:
+    """Answer one request from the shared cache or upstream."""
+    proxy: WeatherProxy = request.app.state.proxy
+    try:
+        body, etag, expires_at = await proxy.fetch(
+            endpoint, normalize_params(endpoint, request.query_params)
+        )
+    except WeatherServiceError as e:
+        return error_response(e)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(0, int(expires_at - time.time()))}",
+    }
+    if etag_matches(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/data/2.5/weather")
+async def current_weather(request: Request) -> Response:
+    """Current weather by city name (q), city ID (id) or coordinates (lat, lon)."""
+    return await relay("weather", request)
+
+
+@app.get("/data/2.5/forecast")
+async def forecast(request: Request) -> Response:
+    """5-day / 3-hour forecast."""
+    return await relay("forecast", request)
+
+
+@app.get("/data/2.5/group")
+async def group(request: Request) -> Response:
+    """Current weather for up to 20 city IDs."""
+    return await relay("group", request)
+
+
+@app.get("/health")
+async def health(request: Request) -> Dict:
+    """Liveness check with the cache size."""
+    return {"status": "ok", "cached": len(request.app.state.proxy.cache)}
+
+
+@app.get("/metrics")
+async def metrics(request: Request) -> Response:
+    """Prometheus metrics (requires WEATHER_METRICS=true)."""
+    service_metrics = request.app.state.proxy.service.metrics
+    if service_metrics is None:
+        return Response("Metrics are disabled (set WEATHER_METRICS=true).\n", status_code=404)
+    return Response(service_metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=Config.PROXY_HOST, port=Config.PROXY_PORT)
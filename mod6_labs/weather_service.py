@@ -1,33 +1,535 @@
 # weather_service.py
 """Weather API service layer."""
 
+import asyncio
+import time
 import httpx
-from typing import Dict, Optional
+from typing import (
+    AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List,
+    Optional, Set, Tuple, TypeVar, Union,
+)
 from config import Config
+from weather_cache import ResponseCache, FRESH, STALE
+from disk_cache import DiskCache
+from models import CurrentWeather, Forecast, loads
+from metrics import ServiceMetrics
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, TokenBucket
+from cassette import build_transport
+from units import CANONICAL
+
+try:
+    import h2  # noqa: F401  (only needed for HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Parsed record type returned by the cache helpers
+Record = TypeVar("Record", CurrentWeather, Forecast)
 
 
 class WeatherServiceError(Exception):
     """Custom exception for weather service errors."""
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        # HTTP status of the API response behind the error, if there was one
+        self.status_code = status_code
+
+
+class ServiceUnavailableError(WeatherServiceError):
+    """Raised when the API cannot be reached (timeouts, network errors, 5xx)."""
     pass
 
 
 class WeatherService:
     """Service for fetching weather data from OpenWeatherMap API."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        persist: bool = True,
+    ):
+        """
+        Args:
+            transport: Custom httpx transport (e.g. a local stand-in for
+                benchmarks); defaults to the one selected by
+                Config.TRANSPORT (the real network, or a cassette)
+            persist: Keep the last responses on disk across restarts
+                (Config.DISK_CACHE_FILE); off for one-shot tools
+        """
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
         self.timeout = Config.TIMEOUT
+        self.transport = transport if transport is not None else build_transport()
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Requests currently on the wire, shared by identical concurrent calls
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+        # Cached responses and the background refreshes of stale entries
+        self.cache = ResponseCache(Config.CACHE_MAX_ENTRIES, Config.CACHE_MAX_STALE)
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+        # Last responses kept across restarts. A cassette must neither be
+        # answered from the user's cache nor written into it, so record and
+        # replay sessions keep theirs in memory.
+        cassette = transport is None and Config.TRANSPORT != "live"
+        self.disk_cache: Optional[DiskCache] = None
+        if persist:
+            self.disk_cache = DiskCache(":memory:" if cassette else Config.DISK_CACHE_FILE)
+        self._disk_writes: Set[asyncio.Future] = set()  # drained by close()
+
+        # Retries, per-host circuit breakers and client-side rate limiting
+        self.retry_policy = RetryPolicy(
+            Config.RETRY_ATTEMPTS, Config.RETRY_BASE_DELAY, Config.RETRY_MAX_DELAY
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limiter = TokenBucket(Config.RATE_LIMIT_PER_MINUTE)
+
+        # Request counters and latency histograms (None when disabled)
+        self.metrics = ServiceMetrics() if Config.METRICS_ENABLED else None
+
+        # City IDs learned from earlier responses (normalized name -> ID),
+        # used to batch lookups through the group endpoint
+        self.city_ids: Dict[str, int] = {}
+
+    async def start(self):
+        """
+        Open the shared connection pool.
+
+        Every request made by this service reuses the same keep-alive
+        connections, so only the first lookup pays for the TCP/TLS handshake.
+        Calling start() more than once is harmless.
+        """
+        if self._client is not None and not self._client.is_closed:
+            return
+
+        limits = httpx.Limits(
+            max_connections=Config.MAX_CONNECTIONS,
+            max_keepalive_connections=Config.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.KEEPALIVE_EXPIRY,
+        )
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            # HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+            http2=Config.HTTP2 and HTTP2_AVAILABLE,
+            transport=self.transport,
+        )
+
+    async def close(self):
+        """Close the shared connection pool."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+        # Let pending writes finish before the connection goes away
+        if self._disk_writes:
+            await asyncio.gather(*self._disk_writes, return_exceptions=True)
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    def write_metrics(self, path: str):
+        """
+        Write a metrics snapshot to a file.
+        
+        Files ending in ".prom" get the Prometheus text format, anything
+        else gets JSON. Does nothing when metrics are disabled.
+        """
+        if not self.metrics:
+            return
+        with open(path, "w") as f:
+            if path.endswith(".prom"):
+                f.write(self.metrics.to_prometheus())
+            else:
+                f.write(self.metrics.to_json())
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get(self, url: str, params: Dict) -> httpx.Response:
+        """
+        Send a GET request through the shared client.
+        
+        Concurrent calls for the same URL and parameters share one HTTP
+        request (single-flight): every caller awaits the same response, or
+        gets the same exception if it fails.
+        """
+        key = (url, tuple(sorted((name, str(value)) for name, value in params.items())))
+        request = self._in_flight.get(key)
+        if request is not None and self.metrics:
+            self.metrics.record_coalesced()
+        if request is None:
+            request = asyncio.ensure_future(self._send(url, params))
+            self._in_flight[key] = request
+            request.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shield the shared request so one caller giving up does not
+        # cancel it for everyone else
+        return await asyncio.shield(request)
+
+    async def _send(self, url: str, params: Dict) -> httpx.Response:
+        """
+        Send a GET request through the shared client, opening it if needed.
+        
+        Every attempt waits for the rate limiter. Timeouts, network errors,
+        429 and 5xx answers are retried with backoff; the last response or
+        error is returned to the caller. While the host's circuit breaker
+        is open, requests fail fast with CircuitOpenError. Every attempt
+        is recorded in the metrics.
+        """
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        metrics = self.metrics
+        endpoint = self._endpoint_name(url)
+
+        host = httpx.URL(url).host
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_TIMEOUT
+            )
+
+        last_attempt = self.retry_policy.attempts - 1
+        for attempt in range(self.retry_policy.attempts):
+            breaker.before_request()
+            await self.rate_limiter.acquire()
+
+            start = time.perf_counter()
+            try:
+                response = await self._client.get(url, params=params)
+            except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                breaker.record_failure()
+                if metrics:
+                    metrics.record_request(
+                        endpoint, time.perf_counter() - start, error=self._error_class(e)
+                    )
+                if attempt == last_attempt:
+                    raise
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+                continue
+            except BaseException as e:
+                breaker.record_failure()
+                if metrics and isinstance(e, httpx.HTTPError):
+                    metrics.record_request(
+                        endpoint, time.perf_counter() - start, error=self._error_class(e)
+                    )
+                raise
+
+            if metrics:
+                metrics.record_request(
+                    endpoint,
+                    time.perf_counter() - start,
+                    status=response.status_code,
+                    error=self._status_error(response.status_code),
+                    nbytes=len(response.content),
+                )
+
+            if response.status_code == 429:
+                # Over quota: hold back every request, not just this one
+                retry_after = self._retry_after(response)
+                self.rate_limiter.pause(self.retry_policy.delay(attempt, retry_after))
+                breaker.record_success()
+            elif response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+                return response
+
+            if attempt == last_attempt:
+                return response
+            await asyncio.sleep(self.retry_policy.delay(attempt, self._retry_after(response)))
+
+    @staticmethod
+    def _endpoint_name(url: str) -> str:
+        """Metrics label of an endpoint URL, e.g. "weather" or "forecast"."""
+        return url.rstrip("/").rsplit("/", 1)[-1]
+
+    @staticmethod
+    def _error_class(error: Exception) -> str:
+        """Metrics error class of a failed HTTP attempt."""
+        if isinstance(error, httpx.TimeoutException):
+            return "timeout"
+        if isinstance(error, httpx.NetworkError):
+            return "network"
+        return "http_error"
+
+    @staticmethod
+    def _status_error(status: int) -> Optional[str]:
+        """Metrics error class of an HTTP status, or None for 200."""
+        if status == 200:
+            return None
+        return {
+            404: "not_found",
+            401: "unauthorized",
+            429: "rate_limited",
+        }.get(status, "server_error" if status >= 500 else "bad_status")
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Read a Retry-After header given in seconds."""
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    async def _request(self, url: str, params: Dict, not_found: str) -> Dict:
+        """
+        Send a GET request and turn failures into WeatherServiceError.
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+            not_found: Message to use when the API answers 404
+            
+        Returns:
+            Decoded JSON response
+            
+        Raises:
+            ServiceUnavailableError: If the API cannot be reached
+            WeatherServiceError: For any other failure
+        """
+        metrics = self.metrics
+        error = None  # outcome reported to the metrics (attempts are recorded by _send)
+
+        try:
+            try:
+                response = await self._get(url, params)
+            except CircuitOpenError:
+                error = "circuit_open"
+                raise ServiceUnavailableError(
+                    "Weather service is currently unavailable. "
+                    "Please try again later."
+                )
+            except httpx.TimeoutException:
+                error = "timeout"
+                raise ServiceUnavailableError(
+                    "Request timed out. Please check your internet connection."
+                )
+            except httpx.NetworkError:
+                error = "network"
+                raise ServiceUnavailableError(
+                    "Network error. Please check your internet connection."
+                )
+            except httpx.HTTPError as e:
+                error = "http_error"
+                raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
+            
+            # Check for HTTP errors
+            if response.status_code == 404:
+                error = "not_found"
+                raise WeatherServiceError(not_found, 404)
+            elif response.status_code == 401:
+                error = "unauthorized"
+                raise WeatherServiceError(
+                    "Invalid API key. Please check your configuration.", 401
+                )
+            elif response.status_code == 429:
+                error = "rate_limited"
+                raise ServiceUnavailableError(
+                    "Too many requests. Please try again in a minute.", 429
+                )
+            elif response.status_code >= 500:
+                error = "server_error"
+                raise ServiceUnavailableError(
+                    "Weather service is currently unavailable. "
+                    "Please try again later.",
+                    response.status_code,
+                )
+            elif response.status_code != 200:
+                error = "bad_status"
+                raise WeatherServiceError(
+                    f"Error fetching weather data: {response.status_code}",
+                    response.status_code,
+                )
+            
+            try:
+                return loads(response.content)
+            except ValueError as e:
+                error = "invalid_json"
+                raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
+
+        finally:
+            if metrics:
+                metrics.record_lookup(self._endpoint_name(url), error)
+
+    @staticmethod
+    def _cache_key(endpoint: str, city: str) -> Hashable:
+        """
+        Build a cache key that ignores case and surrounding whitespace.
+
+        Data is always fetched in the canonical units, so the key does not
+        depend on the units it is displayed in.
+        """
+        return (endpoint, city.strip().casefold())
+
+    @staticmethod
+    def _disk_key(key: Hashable) -> str:
+        """Turn an in-memory cache key into a disk cache key."""
+        return "|".join(str(part) for part in key)
+
+    async def _cached(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Dict]],
+        parse: Callable[[Dict], Record],
+        force: bool = False,
+    ) -> Record:
+        """
+        Return a cached record, fetching it when missing.
+        
+        Lookups go memory -> disk -> network. Memory holds parsed records,
+        the disk holds the raw JSON. Stale entries are returned right away
+        while a fresh copy is fetched in the background
+        (stale-while-revalidate). When the network is down, the last
+        response stored on disk is returned with its cached_at field set.
+        
+        Args:
+            key: Cache key
+            ttl: Seconds a fetched response stays fresh
+            fetch: Coroutine factory returning the raw decoded response
+            parse: Turns the raw response into a record
+            force: Skip the caches and fetch (the result is still cached);
+                failures are raised instead of falling back to the disk
+        """
+        metrics = self.metrics
+        endpoint = key[0]
+        if force:
+            return self._store(key, await fetch(), parse, ttl)
+
+        state, record = self.cache.get(key)
+        if state == FRESH:
+            if metrics:
+                metrics.record_cache(endpoint, "hit")
+            return record
+        if state == STALE:
+            if metrics:
+                metrics.record_cache(endpoint, "stale")
+            self._refresh_in_background(key, ttl, fetch, parse)
+            return record
+
+        stored = None
+        if self.disk_cache is not None:
+            stored = await asyncio.to_thread(self.disk_cache.get, self._disk_key(key))
+        if stored is not None:
+            data, fetched_at = stored
+            age = time.time() - fetched_at
+            if age < ttl:
+                if metrics:
+                    metrics.record_cache(endpoint, "disk")
+                record = parse(data)
+                self.cache.set(key, record, ttl - age)
+                return record
+
+        if metrics:
+            metrics.record_cache(endpoint, "miss")
+        try:
+            data = await fetch()
+        except ServiceUnavailableError:
+            if stored is None:
+                raise
+            if metrics:
+                metrics.record_cache(endpoint, "offline")
+            data, fetched_at = stored
+            return parse(data)._replace(cached_at=fetched_at)
+
+        return self._store(key, data, parse, ttl)
+
+    def _store(
+        self,
+        key: Hashable,
+        data: Dict,
+        parse: Callable[[Dict], Record],
+        ttl: float,
+    ) -> Record:
+        """Cache a fresh response: the record in memory, the raw JSON on disk."""
+        record = parse(data)
+        self.cache.set(key, record, ttl)
+        if self.disk_cache is not None:
+            write = asyncio.get_running_loop().run_in_executor(
+                None, self.disk_cache.set, self._disk_key(key), data
+            )
+            self._disk_writes.add(write)
+            write.add_done_callback(self._disk_writes.discard)
+        return record
+
+    def _refresh_in_background(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Dict]],
+        parse: Callable[[Dict], Record],
+    ):
+        """Start at most one background refresh per cache key."""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self._store(key, await fetch(), parse, ttl)
+            except WeatherServiceError:
+                pass  # Keep serving the stale entry until a refresh succeeds
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def is_fresh(self, endpoint: str, city: str) -> bool:
+        """Whether a city's "weather" or "forecast" lookup would hit the memory cache."""
+        return self.cache.get(self._cache_key(endpoint, city))[0] == FRESH
+
+    async def get_cached_weather(self, city: str) -> Optional[CurrentWeather]:
+        """
+        Return the last known weather for a city without any network I/O.
+        
+        Used to draw the first frame on startup. The disk is read in a
+        worker thread, like every other cache read. Records read from disk
+        carry the time they were fetched in cached_at.
+        
+        Args:
+            city: Name of the city
+            
+        Returns:
+            Current weather, or None if nothing is cached
+        """
+        key = self._cache_key("weather", city)
+        _, record = self.cache.get(key)
+        if record is None:
+            if self.disk_cache is None:
+                return None
+            stored = await asyncio.to_thread(self.disk_cache.get, self._disk_key(key))
+            if stored is None:
+                return None
+            data, fetched_at = stored
+            record = CurrentWeather.from_json(data)._replace(cached_at=fetched_at)
+
+        # Knowing the ID lets get_weather_many batch the refresh
+        if record.city_id:
+            self.city_ids[city.strip().casefold()] = record.city_id
+        return record
     
-    async def get_weather(self, city: str) -> Dict:
+    async def get_weather(self, city: str, force: bool = False) -> CurrentWeather:
         """
         Fetch weather data for a given city.
         
+        Repeated lookups for the same city are served from the cache.
+        
         Args:
             city: Name of the city
+            force: Fetch even when the city is cached
             
         Returns:
-            Dictionary containing weather data
+            Current weather for the city
             
         Raises:
             WeatherServiceError: If the request fails
@@ -35,59 +537,185 @@ class WeatherService:
         if not city:
             raise WeatherServiceError("City name cannot be empty")
         
+        weather = await self._cached(
+            self._cache_key("weather", city),
+            Config.CACHE_TTL_WEATHER,
+            lambda: self._fetch_weather(city),
+            CurrentWeather.from_json,
+            force,
+        )
+        if weather.city_id:
+            self.city_ids[city.strip().casefold()] = weather.city_id
+        return weather
+
+    async def get_weather_by_id(self, city_id: int) -> CurrentWeather:
+        """
+        Fetch weather data for an OpenWeatherMap city ID.
+        
+        Args:
+            city_id: OpenWeatherMap city ID
+            
+        Returns:
+            Current weather for the city
+            
+        Raises:
+            WeatherServiceError: If the request fails
+        """
+        params = {
+            "id": city_id,
+            "appid": self.api_key,
+            "units": CANONICAL,
+        }
+        return await self._cached(
+            self._cache_key("weather", f"id:{city_id}"),
+            Config.CACHE_TTL_WEATHER,
+            lambda: self._request(
+                self.base_url, params, f"City ID {city_id} not found."
+            ),
+            CurrentWeather.from_json,
+        )
+
+    async def get_weather_many(
+        self,
+        cities: Iterable[Union[str, int]],
+        concurrency: Optional[int] = None,
+        force: bool = False,
+    ) -> AsyncIterator[Tuple[Union[str, int], Optional[CurrentWeather], Optional[Exception]]]:
+        """
+        Fetch weather for many cities concurrently.
+        
+        Results are yielded as they complete, so callers can render them
+        progressively. City IDs (given directly, or learned from earlier
+        lookups by name) are fetched in batches through the group endpoint.
+        
+        Args:
+            cities: City names and/or OpenWeatherMap city IDs
+            concurrency: Maximum number of requests in flight
+                (defaults to Config.MAX_CONCURRENT_REQUESTS)
+            force: Fetch every city, even those cached, e.g. to look for
+                a newer observation
+            
+        Yields:
+            Tuples of (city, weather, error); exactly one of weather/error is set
+        """
+        semaphore = asyncio.Semaphore(concurrency or Config.MAX_CONCURRENT_REQUESTS)
+        by_id: Dict[int, Union[str, int]] = {}
+        tasks = []
+
+        async def fetch_one(city: str):
+            async with semaphore:
+                try:
+                    return [(city, await self.get_weather(city, force), None)]
+                except WeatherServiceError as e:
+                    return [(city, None, e)]
+
+        for city in cities:
+            if isinstance(city, int):
+                by_id[city] = city
+                continue
+
+            # Names without a known ID, already cached or sharing an ID with
+            # another entry go through the regular single lookup
+            city_id = self.city_ids.get(city.strip().casefold())
+            if (
+                city_id is None
+                or city_id in by_id
+                or (not force and self.is_fresh("weather", city))
+            ):
+                tasks.append(asyncio.ensure_future(fetch_one(city)))
+            else:
+                by_id[city_id] = city
+
+        ids = list(by_id)
+        for i in range(0, len(ids), Config.GROUP_BATCH_SIZE):
+            batch = {city_id: by_id[city_id] for city_id in ids[i:i + Config.GROUP_BATCH_SIZE]}
+            tasks.append(
+                asyncio.ensure_future(self._fetch_group_batch(batch, semaphore, force))
+            )
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_group_batch(
+        self,
+        batch: Dict[int, Union[str, int]],
+        semaphore: asyncio.Semaphore,
+        force: bool = False,
+    ) -> List[Tuple[Union[str, int], Optional[CurrentWeather], Optional[Exception]]]:
+        """
+        Fetch up to Config.GROUP_BATCH_SIZE cities with one group request.
+        
+        Args:
+            batch: City ID -> the city as the caller asked for it
+            semaphore: Limits the number of requests in flight
+            force: Fetch cities that are fresh in the cache too
+            
+        Returns:
+            List of (city, weather, error) tuples, one per city in the batch
+        """
+        results = []
+        pending = {}
+        for city_id, city in batch.items():
+            key = self._cache_key("weather", city if isinstance(city, str) else f"id:{city}")
+            state, record = self.cache.get(key)
+            if state == FRESH and not force:
+                results.append((city, record, None))
+            else:
+                pending[city_id] = (city, key)
+        if not pending:
+            return results
+
+        params = {
+            "id": ",".join(str(city_id) for city_id in pending),
+            "appid": self.api_key,
+            "units": CANONICAL,
+        }
+        try:
+            async with semaphore:
+                data = await self._request(
+                    Config.GROUP_URL, params, "None of the requested cities were found."
+                )
+        except WeatherServiceError as e:
+            return results + [(city, None, e) for city, _ in pending.values()]
+
+        found = {item.get("id"): item for item in data.get("list", [])}
+        for city_id, (city, key) in pending.items():
+            if city_id in found:
+                record = self._store(
+                    key, found[city_id], CurrentWeather.from_json, Config.CACHE_TTL_WEATHER
+                )
+                results.append((city, record, None))
+            else:
+                results.append(
+                    (city, None, WeatherServiceError(f"City ID {city_id} not found."))
+                )
+        return results
+
+    async def _fetch_weather(self, city: str) -> Dict:
+        """Fetch current weather for a city from the API."""
         # Build request parameters
         params = {
             "q": city,
             "appid": self.api_key,
-            "units": Config.UNITS,
+            "units": CANONICAL,
         }
         
-        try:
-            # Make async HTTP request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                
-                # Check for HTTP errors
-                if response.status_code == 404:
-                    raise WeatherServiceError(
-                        f"City '{city}' not found. Please check the spelling."
-                    )
-                elif response.status_code == 401:
-                    raise WeatherServiceError(
-                        "Invalid API key. Please check your configuration."
-                    )
-                elif response.status_code >= 500:
-                    raise WeatherServiceError(
-                        "Weather service is currently unavailable. "
-                        "Please try again later."
-                    )
-                elif response.status_code != 200:
-                    raise WeatherServiceError(
-                        f"Error fetching weather data: {response.status_code}"
-                    )
-                
-                # Parse JSON response
-                data = response.json()
-                return data
-                
-        except httpx.TimeoutException:
-            raise WeatherServiceError(
-                "Request timed out. Please check your internet connection."
-            )
-        except httpx.NetworkError:
-            raise WeatherServiceError(
-                "Network error. Please check your internet connection."
-            )
-        except httpx.HTTPError as e:
-            raise WeatherServiceError(f"HTTP error occurred: {str(e)}")
-        except Exception as e:
-            raise WeatherServiceError(f"An unexpected error occurred: {str(e)}")
+        return await self._request(
+            self.base_url,
+            params,
+            f"City '{city}' not found. Please check the spelling.",
+        )
     
     async def get_weather_by_coordinates(
         self, 
         lat: float, 
         lon: float
-    ) -> Dict:
+    ) -> CurrentWeather:
         """
         Fetch weather data by coordinates.
         
@@ -96,40 +724,88 @@ class WeatherService:
             lon: Longitude
             
         Returns:
-            Dictionary containing weather data
+            Current weather at the coordinates
         """
         params = {
             "lat": lat,
             "lon": lon,
             "appid": self.api_key,
-            "units": Config.UNITS,
+            "units": CANONICAL,
         }
         
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                return response.json()
-                
-        except Exception as e:
-            raise WeatherServiceError(f"Error fetching weather data: {str(e)}")
+        data = await self._request(
+            self.base_url, params, "No weather data found for these coordinates."
+        )
+        return CurrentWeather.from_json(data)
         
     # Bonus Features
-    async def get_forecast(self, city: str) -> Dict:
+    async def get_forecast(self, city: str) -> Forecast:
         """Get 5-day weather forecast."""
-        forecast_url = "https://api.openweathermap.org/data/2.5/forecast"
+        return await self._cached(
+            self._cache_key("forecast", city),
+            Config.CACHE_TTL_FORECAST,
+            lambda: self._fetch_forecast(city),
+            Forecast.from_json,
+        )
+
+    async def get_forecast_by_id(self, city_id: int) -> Forecast:
+        """Get the 5-day forecast for an OpenWeatherMap city ID."""
+        params = {
+            "id": city_id,
+            "appid": self.api_key,
+            "units": CANONICAL,
+        }
+        return await self._cached(
+            self._cache_key("forecast", f"id:{city_id}"),
+            Config.CACHE_TTL_FORECAST,
+            lambda: self._request(
+                Config.FORECAST_URL, params, f"City ID {city_id} not found."
+            ),
+            Forecast.from_json,
+        )
+
+    async def _fetch_forecast(self, city: str) -> Dict:
+        """Fetch the 5-day forecast for a city from the API."""
         params = {
             "q": city,
             "appid": self.api_key,
-            "units": Config.UNITS,
+            "units": CANONICAL,
         }
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(forecast_url, params=params)
-            response.raise_for_status()
-            
-            return response.json()
+        return await self._request(
+            Config.FORECAST_URL,
+            params,
+            f"City '{city}' not found. Please check the spelling.",
+        )
         
+    async def get_raw(self, endpoint: str, params: Dict) -> Dict:
+        """
+        Fetch an endpoint and return its JSON response without parsing it.
+
+        Used by the weather proxy, which relays responses to its clients as
+        they are. Goes through the same pool, retries, circuit breakers and
+        rate limiter as every other lookup, but not through the cache.
+
+        Args:
+            endpoint: "weather", "forecast" or "group"
+            params: Query parameters; the API key is added here
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            WeatherServiceError: If the request fails; ``status_code`` holds
+                the upstream HTTP status when there was one
+        """
+        urls = {
+            "weather": self.base_url,
+            "forecast": Config.FORECAST_URL,
+            "group": Config.GROUP_URL,
+        }
+        return await self._request(
+            urls[endpoint], {**params, "appid": self.api_key}, "Not found."
+        )
+
     async def get_hourly_forecast(self, city: str) -> Dict:
         """Get full hourly forecast from One Call API 3.0."""
         # lat, lon = await self.get_coords(city)
@@ -142,9 +818,10 @@ class WeatherService:
             "appid": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(onecall_url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._request(
+            onecall_url,
+            params,
+            f"City '{city}' not found. Please check the spelling.",
+        )
         
     
\ No newline at end of file
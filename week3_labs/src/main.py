@@ -1,9 +1,25 @@
+import asyncio
+
 import flet as ft
 from db_connection import connect_db
+from loop_watchdog import install as install_watchdog, watch
 from mysql.connector import Error
 
 
+def check_credentials(username, password):
+    # blocking MySQL calls; run this in a worker thread, not on the event loop
+    connection = connect_db()
+    try:
+        cursor = connection.cursor()
+        cursor.execute('SELECT * FROM user WHERE username = %s AND password = %s', (username, password))
+        return cursor.fetchone() is not None
+    finally:
+        connection.close()
+
+
 def main(page: ft.Page):
+    install_watchdog(page)  # no-op unless LOOP_WATCHDOG is set
+
     # configure page layout
     page.window.alignment = ft.alignment.center
     page.window.frameless = True
@@ -48,6 +64,7 @@ def main(page: ft.Page):
     )
 
     # defining an asynchronous function for when the user clicks the login button
+    @watch
     async def login_click(e):
         username = username_field.value
         password = password_field.value
@@ -85,12 +102,7 @@ def main(page: ft.Page):
             return
 
         try:
-            connection = connect_db()
-            cursor = connection.cursor()
-
-            cursor.execute('SELECT * FROM user WHERE username = %s AND password = %s', (username, password))
-            result = cursor.fetchone()
-            connection.close()
+            result = await asyncio.to_thread(check_credentials, username, password)
 
             # open success dialog if there is a result, else open the failure dialog
             page.open(success_dialog) if result else page.open(failure_dialog)
@@ -1,8 +1,10 @@
 # app_logic.py
 import flet as ft
 from database import update_contact_db, delete_contact_db, add_contact_db, get_all_contacts_db
+from loop_watchdog import watch
 
 
+@watch
 def display_contacts(page, contacts_list_view, db_conn, searching=None):
     """Fetches and displays all and searched contacts in the ListView."""
     contacts_list_view.controls.clear()
@@ -47,6 +49,7 @@ def display_contacts(page, contacts_list_view, db_conn, searching=None):
         )
     page.update()
 
+@watch
 def add_contact(page, inputs, contacts_list_view, db_conn):
     """Adds a new contact and refreshes the list."""
     name_input, phone_input, email_input = inputs
@@ -69,6 +72,7 @@ def add_contact(page, inputs, contacts_list_view, db_conn):
 
     page.update()
 
+@watch
 def delete_contact(page, contact_id, db_conn, contacts_list_view, dialog):
     """Deletes a contact and refreshes the list."""
     delete_contact_db(db_conn, contact_id)
@@ -76,6 +80,7 @@ def delete_contact(page, contact_id, db_conn, contacts_list_view, dialog):
 
     page.close(dialog)
 
+@watch
 def edit_contact(page, dialog, db_conn, cid, textfields, contacts_list_view):
     'Edit a contact and refreshes the list'
     name_field, phone_field, email_field = textfields
@@ -172,6 +177,7 @@ def open_delete_dialog(page, contact_id, db_conn, contacts_list_view):
     )
     page.open(delete_dialog)
 
+@watch
 def toggle_theme(page, button, textfields):
     '''Toggles theme mode of the page'''
     if page.theme_mode is ft.ThemeMode.DARK:
@@ -2,9 +2,11 @@
 import flet as ft
 from database import init_db
 from app_logic import *
+from loop_watchdog import install as install_watchdog
 
 
 def main(page: ft.Page):
+    install_watchdog(page)  # no-op unless LOOP_WATCHDOG is set
     page.title = "Contact Book"
     page.vertical_alignment = ft.MainAxisAlignment.START
     page.horizontal_alignment = ft.CrossAxisAlignment.CENTER